@@ -0,0 +1,276 @@
+import hashlib
+import json
+from collections import namedtuple
+from datetime import date
+from pathlib import Path
+
+from store import STORE_DIR, file_digest
+
+# Alertas automáticas sobre el resumen mensual de `ledger`. Cada regla se
+# declara como dato: sobre qué serie mensual corre, qué comprobación aplica y
+# junto a qué gráfica se muestra. Comprobaciones:
+#   * threshold: el valor del mes pasa un límite (above / below)
+#   * jump:      cambio porcentual contra el mes inmediato anterior (pct > 0
+#                sube al menos pct; pct < 0 baja al menos |pct|)
+#   * growth:    cambio promedio por mes en una ventana de `window` meses
+#                consecutivos de al menos `min_rate` pesos
+#   * gap:       meses sin Estado Financiero desde el primero hasta `until`
+#                ("AAAA-MM"; None es el último mes cerrado, el anterior al
+#                actual), así también se detectan los que faltan al final
+# El resultado se guarda en aggregates/alerts.json junto con la huella de cada
+# regla. La ingesta sólo vuelve a evaluar los meses que cambiaron y los que
+# dependen de ellos (el mes siguiente para `jump`, la ventana para `growth`);
+# una regla nueva o modificada se evalúa sobre toda la historia. Las reglas
+# con `until` None se resuelven con la fecha de hoy antes de tomar su huella:
+# al cambiar de mes la huella cambia y la regla se vuelve a evaluar.
+# Este módulo sólo usa la biblioteca estándar en el nivel superior: la página
+# lee las alertas sin importar pandas.
+Rule = namedtuple("Rule", "key chart series check params severity message")
+
+RULES = [
+    Rule(
+        "saldo_faltante", "reserva", "periodos", "gap", {"until": None}, "error",
+        "No hay Estado Financiero de **{period}**.",
+    ),
+    Rule(
+        "saldo_tope", "reserva", "saldo_final", "threshold", {"above": 300_000}, "warning",
+        "El saldo de **{period}** es de **${value:,.2f}**: la reserva supera $300,000 sin un plan de inversión presentado.",
+    ),
+    Rule(
+        "saldo_crecimiento", "reserva", "saldo_final", "growth", {"window": 6, "min_rate": 20_000}, "warning",
+        "En los 6 meses a **{period}** el saldo creció en promedio **${value:,.2f} al mes**; el excedente indica que la cuota puede revisarse.",
+    ),
+    Rule(
+        "admon_salto", "gasto_admon", "gasto_admon", "jump", {"pct": 50}, "error",
+        "El gasto de administración subió **{value:.1f}%** en **{period}** (de ${previous:,.2f} a ${current:,.2f}).",
+    ),
+]
+
+SEVERITIES = {"error": "🛑", "warning": "⚠️"}
+ALERT_ROWS = 5  # alertas por regla en pantalla; las más recientes
+
+
+def _alerts_path(store_dir):
+    return Path(store_dir) / "aggregates" / "alerts.json"
+
+
+def rule_digest(rule):
+    return hashlib.sha1(json.dumps(rule._asdict(), sort_keys=True).encode()).hexdigest()
+
+
+def last_closed_period(today=None):
+    today = today or date.today()
+    month = today.year * 12 + today.month - 2
+    return f"{month // 12:04d}-{month % 12 + 1:02d}"
+
+
+# Regla con los parámetros que dependen de la fecha ya fijados
+def resolve(rule, today=None):
+    if rule.check == "gap" and rule.params.get("until") is None:
+        return rule._replace(params={**rule.params, "until": last_closed_period(today)})
+    return rule
+
+
+def load_state(store_dir=STORE_DIR):
+    path = _alerts_path(store_dir)
+    if path.exists():
+        return json.loads(path.read_text())
+    return {"rules": {}, "alerts": []}
+
+
+def save_state(state, store_dir=STORE_DIR):
+    path = _alerts_path(store_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, ensure_ascii=False))
+    tmp.replace(path)
+
+
+# ¿Las alertas guardadas corresponden a las reglas declaradas (y al mes actual)?
+def is_current(store_dir=STORE_DIR, rules=RULES, today=None):
+    return load_state(store_dir)["rules"] == {rule.key: rule_digest(resolve(rule, today)) for rule in rules}
+
+
+# Cambia cada vez que se reescriben las alertas; sirve como llave de caché
+def version(store_dir=STORE_DIR):
+    path = _alerts_path(store_dir)
+    return file_digest(path) if path.exists() else ""
+
+
+def read_alerts(store_dir=STORE_DIR, condominium=None):
+    alerts = load_state(store_dir)["alerts"]
+    if condominium is not None:
+        alerts = [alert for alert in alerts if alert["condominium"] == condominium]
+    return alerts
+
+
+# --- SERIES MENSUALES (condominium, period, value) ---
+def _monthly_series(monthly, column):
+    series = monthly.groupby(["condominium", "period"], observed=True)[column].sum(min_count=1)
+    return series.dropna().rename("value").reset_index()
+
+
+def _concept_series(concepts, kind, prefix):
+    rows = concepts[(concepts["kind"] == kind) & concepts["concept"].str.startswith(prefix)]
+    return rows.groupby(["condominium", "period"], observed=True)["amount"].sum().rename("value").reset_index()
+
+
+SERIES = {
+    "periodos": lambda monthly, concepts: monthly.groupby(["condominium", "period"], observed=True).size().rename("value").reset_index(),
+    "saldo_final": lambda monthly, concepts: _monthly_series(monthly, "ending_balance"),
+    "ingresos": lambda monthly, concepts: _monthly_series(monthly, "total_incomes"),
+    "egresos": lambda monthly, concepts: _monthly_series(monthly, "total_expenses"),
+    "gasto_admon": lambda monthly, concepts: _concept_series(concepts, "egreso", "ADMINISTRACION"),
+}
+
+
+def _month(periods):
+    starts = periods.str.slice(0, 4).astype(int), periods.str.slice(5, 7).astype(int)
+    return starts[0] * 12 + starts[1] - 1
+
+
+def _period(months):
+    return [f"{month // 12:04d}-{month % 12 + 1:02d}" for month in months]
+
+
+# --- COMPROBACIONES ---
+# Cada una recibe la serie ordenada por condominio y mes (con la columna
+# `month`) y devuelve las filas que disparan, con `value`, `previous` y
+# `current` para el mensaje.
+def _previous(series, lag):
+    same = series["condominium"].eq(series["condominium"].shift(lag))
+    consecutive = same & series["month"].sub(series["month"].shift(lag)).eq(lag)
+    return series["value"].shift(lag).where(consecutive)
+
+
+def check_threshold(series, above=None, below=None):
+    mask = series["value"].gt(above if above is not None else float("inf"))
+    if below is not None:
+        mask |= series["value"].lt(below)
+    found = series[mask]
+    return found.assign(previous=None, current=found["value"])
+
+
+def check_jump(series, pct):
+    previous = _previous(series, 1)
+    change = (series["value"] - previous) / previous.abs().where(previous != 0) * 100
+    mask = change >= pct if pct > 0 else change <= pct
+    return series[mask].assign(previous=previous[mask], current=series.loc[mask, "value"], value=change[mask])
+
+
+def check_growth(series, window, min_rate):
+    previous = _previous(series, window - 1)
+    rate = (series["value"] - previous) / (window - 1)
+    mask = rate >= min_rate
+    return series[mask].assign(previous=previous[mask], current=series.loc[mask, "value"], value=rate[mask])
+
+
+def check_gap(series, until=None):
+    import pandas as pd
+
+    last = _month(pd.Series([until]))[0] if until else None
+    rows = [
+        (condominium, month)
+        for condominium, months in series.groupby("condominium", sort=False)["month"]
+        for month in sorted(set(range(months.min(), max(months.max(), last or 0) + 1)) - set(months))
+    ]
+    missing = pd.DataFrame(rows, columns=["condominium", "month"])
+    missing["period"] = _period(missing["month"])
+    return missing.assign(value=None, previous=None, current=None)
+
+
+CHECKS = {"threshold": check_threshold, "jump": check_jump, "growth": check_growth, "gap": check_gap}
+
+
+# Meses posteriores cuyo resultado depende de un mes dado (None: toda la serie)
+def reach(rule):
+    if rule.check == "threshold":
+        return 0
+    if rule.check == "jump":
+        return 1
+    if rule.check == "growth":
+        return rule.params["window"] - 1
+    return None
+
+
+def _format(rule, found):
+    alerts = []
+    for row in found.itertuples(index=False):
+        alerts.append({
+            "rule": rule.key,
+            "chart": rule.chart,
+            "severity": rule.severity,
+            "condominium": row.condominium,
+            "period": row.period,
+            "value": None if row.value is None else float(row.value),
+            "message": rule.message.format(period=row.period, value=row.value, previous=row.previous, current=row.current),
+        })
+    return alerts
+
+
+def evaluate(rule, series, targets=None):
+    # `targets`: meses ordinales a evaluar; None evalúa toda la serie
+    if targets is not None:
+        # Sólo hace falta la serie desde `reach` meses antes del primer objetivo
+        series = series[series["month"] >= min(targets) - reach(rule)]
+    found = CHECKS[rule.check](series, **rule.params)
+    if targets is not None:
+        found = found[found["month"].isin(targets)]
+    return _format(rule, found)
+
+
+def refresh(store_dir=STORE_DIR, periods=(), rules=RULES, today=None):
+    # Vuelve a evaluar los meses `periods` (los que cambió la ingesta) y lo que
+    # depende de ellos; las reglas nuevas o modificadas se evalúan completas.
+    import ledger
+    import pandas as pd
+
+    rules = [resolve(rule, today) for rule in rules]
+    state = load_state(store_dir)
+    digests = {rule.key: rule_digest(rule) for rule in rules}
+    stale = {rule.key for rule in rules if state["rules"].get(rule.key) != digests[rule.key]}
+    changed = set(_month(pd.Series(sorted(periods), dtype=str))) if periods else set()
+    if state["rules"] == digests and not changed:
+        return state["alerts"]
+
+    monthly, concepts = ledger.read_monthly(store_dir), ledger.read_concepts(store_dir)
+    series_cache = {}
+    kept = [alert for alert in state["alerts"] if alert["rule"] in digests and alert["rule"] not in stale]
+    fresh = []
+    for rule in rules:
+        if rule.key in stale:
+            targets = None
+        else:
+            if not changed:
+                continue
+            steps = reach(rule)
+            targets = None if steps is None else {month + step for month in changed for step in range(steps + 1)}
+        if rule.series not in series_cache:
+            series = SERIES[rule.series](monthly, concepts)
+            series = series.assign(month=_month(series["period"].astype(str)))
+            series_cache[rule.series] = series.sort_values(["condominium", "month"], kind="stable").reset_index(drop=True)
+        if targets is None:
+            kept = [alert for alert in kept if alert["rule"] != rule.key]
+        else:
+            target_periods = set(_period(targets))
+            kept = [alert for alert in kept if alert["rule"] != rule.key or alert["period"] not in target_periods]
+        fresh.extend(evaluate(rule, series_cache[rule.series], targets))
+
+    alerts = sorted(kept + fresh, key=lambda alert: (alert["condominium"], alert["chart"], alert["rule"], alert["period"]))
+    save_state({"rules": digests, "alerts": alerts}, store_dir)
+    return alerts
+
+
+# Alertas de una gráfica, agrupadas por regla, debajo de la gráfica
+def render_alerts(box, alerts, chart):
+    by_rule = {}
+    for alert in alerts:
+        if alert["chart"] == chart:
+            by_rule.setdefault(alert["rule"], []).append(alert)
+    for rule_alerts in by_rule.values():
+        recent = sorted(rule_alerts, key=lambda alert: alert["period"], reverse=True)
+        lines = [f"* {alert['message']}" for alert in recent[:ALERT_ROWS]]
+        if len(recent) > ALERT_ROWS:
+            lines.append(f"* … y {len(recent) - ALERT_ROWS} meses más.")
+        severity = recent[0]["severity"]
+        getattr(box, severity)("\n".join(lines), icon=SEVERITIES[severity])
@@ -0,0 +1,106 @@
+import hashlib
+import html
+import os
+from pathlib import Path
+
+# Imágenes del informe. Cada original se convierte una sola vez a miniaturas
+# WebP de varios anchos y a una versión WebP a resolución completa. Los
+# archivos se nombran con el hash del contenido y se sirven como estáticos de
+# Streamlit (server.enableStaticServing), así que el navegador los cachea y la
+# sesión no vuelve a enviar los bytes. La resolución completa sólo se descarga
+# al hacer clic en la miniatura.
+BASE_DIR = Path(__file__).resolve().parent
+STATIC_DIR = BASE_DIR / "static" / "assets"
+STATIC_URL = "app/static/assets"
+
+THUMBNAIL_WIDTHS = (360, 720)
+WEBP_QUALITY = 80
+
+
+class MissingAsset(FileNotFoundError):
+    pass
+
+
+def require(name, base_dir=BASE_DIR):
+    path = Path(base_dir) / name
+    if not path.is_file():
+        similar = sorted(p.name for p in Path(base_dir).glob(f"*{path.suffix}"))
+        raise MissingAsset(
+            f"No se encontró la imagen '{name}' en {base_dir}. "
+            f"Imágenes disponibles: {', '.join(similar) or 'ninguna'}"
+        )
+    return path
+
+
+def content_hash(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+
+
+def _save_webp(image, target, width=None):
+    from PIL import Image
+
+    if target.exists():
+        return
+    if width and image.width > width:
+        height = round(image.height * width / image.width)
+        image = image.resize((width, height), Image.LANCZOS)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}")
+    image.save(tmp, "WEBP", quality=WEBP_QUALITY, method=6)
+    tmp.replace(target)
+
+
+# Genera (si faltan) las variantes de una imagen y devuelve sus nombres
+def build(name, base_dir=BASE_DIR, static_dir=STATIC_DIR):
+    from PIL import Image, ImageOps
+
+    source = require(name, base_dir)
+    static_dir = Path(static_dir)
+    static_dir.mkdir(parents=True, exist_ok=True)
+    digest = content_hash(source)
+    with Image.open(source) as original:
+        # Ancho ya rotado según la orientación EXIF (5-8 intercambian ejes)
+        rotated = original.getexif().get(0x0112, 1) in (5, 6, 7, 8)
+        width = original.height if rotated else original.width
+        full = static_dir / f"{digest}.webp"
+        # Sólo miniaturas más angostas que el original
+        thumbnails = {w: static_dir / f"{digest}-{w}.webp" for w in THUMBNAIL_WIDTHS if w < width}
+        if not full.exists() or not all(path.exists() for path in thumbnails.values()):
+            image = ImageOps.exif_transpose(original).convert("RGB")
+            _save_webp(image, full)
+            for w, path in thumbnails.items():
+                _save_webp(image, path, w)
+    return {
+        "name": name,
+        "full": full.name,
+        "width": width,
+        "thumbnails": {w: path.name for w, path in thumbnails.items()},
+        "fallback": thumbnails[min(thumbnails)].name if thumbnails else full.name,
+    }
+
+
+# Sólo comprueba que existan; no carga Pillow
+def check(names, base_dir=BASE_DIR):
+    for name in names:
+        require(name, base_dir)
+
+
+def build_all(names, base_dir=BASE_DIR, static_dir=STATIC_DIR):
+    # Valida todas primero: si falta una, falla antes de generar nada
+    check(names, base_dir)
+    return {name: build(name, base_dir, static_dir) for name in names}
+
+
+# Miniatura responsiva que abre la resolución completa en otra pestaña
+def figure_html(asset, caption, url=STATIC_URL):
+    srcset = ", ".join(f"{url}/{file} {width}w" for width, file in sorted(asset["thumbnails"].items()))
+    srcset = ", ".join(filter(None, [srcset, f"{url}/{asset['full']} {asset['width']}w"]))
+    caption = html.escape(caption)
+    return (
+        f'<figure style="margin:0">'
+        f'<a href="{url}/{asset["full"]}" target="_blank" rel="noopener">'
+        f'<img src="{url}/{asset["fallback"]}" srcset="{srcset}" '
+        f'sizes="(max-width: 640px) 100vw, 50vw" loading="lazy" alt="{caption}" '
+        f'style="width:100%;height:auto"></a>'
+        f'<figcaption style="font-size:0.875rem;opacity:0.7;text-align:center">{caption}</figcaption>'
+        f'</figure>'
+    )
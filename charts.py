@@ -0,0 +1,206 @@
+import hashlib
+
+import streamlit as st
+
+import metrics
+
+# pandas y plotly.graph_objects se importan dentro de cada función: la página
+# arranca sin cargarlos y sólo los paga la primera sección con gráfica.
+# Las figuras se construyen una sola vez por contenido de datos y se comparten
+# entre todas las sesiones (st.cache_resource). Las entradas caducan por tiempo
+# y por número para que el proceso no crezca sin límite.
+FIGURE_CACHE_TTL = 6 * 60 * 60  # segundos
+FIGURE_CACHE_ENTRIES = 32
+
+# Series largas (movimientos diarios, varios años o cuentas): el tamaño de la
+# figura y el trabajo del navegador no deben crecer con la historia.
+#   * más de LABEL_POINTS puntos: sin etiqueta en cada punto, el monto va en el hover
+#   * más de WEBGL_POINTS: Scattergl, líneas submuestreadas a LINE_POINTS (ver
+#     downsample) y barras agregadas por periodo a lo más BAR_BUCKETS
+# `window` (fechas inicio, fin) recorta la serie antes de reducirla: al acercar
+# el periodo se ve más detalle con el mismo presupuesto de puntos.
+LABEL_POINTS = 36
+WEBGL_POINTS = 1000
+LINE_POINTS = 1000
+BAR_BUCKETS = 120
+HOVER_CURRENCY = '%{y:$,.2f}'
+
+
+# La función de formateo para números con dos decimales y separador de miles
+def format_currency(x):
+    return f'{x:,.2f}'
+
+
+# Huella del contenido de un DataFrame (columnas, índice y valores)
+def data_key(df):
+    import pandas as pd
+
+    digest = hashlib.sha1(",".join(map(str, df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return digest.hexdigest()
+
+
+def window_frame(df, window, column='report_date'):
+    import pandas as pd
+
+    if window is None:
+        return df
+    start, end = pd.Timestamp(window[0]), pd.Timestamp(window[1]) + pd.Timedelta(days=1)
+    return df[(df[column] >= start) & (df[column] < end)]
+
+
+# Barras: tal cual o agregadas por periodo si son demasiadas
+def bar_points(dates, values, how):
+    import downsample
+
+    if len(values) <= WEBGL_POINTS:
+        return dates, values
+    buckets = downsample.aggregate(dates, values, how, BAR_BUCKETS)
+    return buckets.index, buckets.to_numpy()
+
+
+# Línea: tal cual o submuestreada (LTTB, con min-max previo en series enormes)
+def line_points(dates, values):
+    import downsample
+
+    if len(values) <= WEBGL_POINTS:
+        return dates, values
+    keep = downsample.downsample(dates.to_numpy(), values.to_numpy(), LINE_POINTS)
+    return dates.iloc[keep], values.iloc[keep]
+
+
+# --- GRÁFICO COMBINADO: SALDO FINAL (BARRAS) E INGRESOS (LÍNEA) ---
+def reserve_figure(df, window=None):
+    with metrics.stage("figure"):
+        df = window_frame(df, window)
+        return _build_reserve_figure(data_key(df), df)
+
+
+@st.cache_resource(ttl=FIGURE_CACHE_TTL, max_entries=FIGURE_CACHE_ENTRIES, show_spinner=False)
+def _build_reserve_figure(key, _df):
+    # `_df` no se hashea: la llave de caché es `key`, la huella de su contenido.
+    import plotly.graph_objects as go
+
+    df = _df
+    labels = len(df) <= LABEL_POINTS
+    webgl = len(df) > WEBGL_POINTS
+    fig_combined = go.Figure()
+
+    # 1. Agregar la Gráfica de Barras (Saldo Final - Eje Y Único)
+    # El saldo es un acumulado: al agregar se toma el último del periodo
+    bar_x, bar_y = bar_points(df['report_date'], df['ending_balance'], 'last')
+    fig_combined.add_trace(
+        go.Bar(
+            x=bar_x,
+            y=bar_y,
+            marker_color='rgba(230, 126, 34, 0.7)', # Naranja para Saldo
+            opacity=0.8,
+            name='Saldo Final (Mensual)',
+            # MOSTRAR DATOS EN BARRAS (Saldo)
+            text=df['ending_balance'].map(format_currency) if labels else None,
+            textposition='outside' if labels else None,
+            hovertemplate=None if labels else HOVER_CURRENCY
+        )
+    )
+
+    # 2. Agregar la Gráfica de Línea (Ingresos Totales - Eje Y Único)
+    incomes = df.dropna(subset=['total_incomes'])
+    line_x, line_y = line_points(incomes['report_date'], incomes['total_incomes'])
+    scatter = go.Scattergl if webgl else go.Scatter
+    fig_combined.add_trace(
+        scatter(
+            x=line_x,
+            y=line_y,
+            mode='lines+markers+text' if labels else 'lines', # Se añade 'text' al modo
+            line=dict(color='rgba(46, 204, 113, 1)', width=3), # Verde para Ingresos
+            marker=dict(size=7),
+            name='Ingresos Totales (Mensual)',
+            # MOSTRAR DATOS EN PUNTOS (Ingresos)
+            text=line_y.map(format_currency) if labels else None,
+            textposition='top center' if labels else None, # Coloca el texto encima del punto
+            hovertemplate=None if labels else HOVER_CURRENCY
+        )
+    )
+
+    # 3. Actualizar el diseño y los títulos de los ejes
+    fig_combined.update_layout(
+        title_text='Flujo de Ingresos (Línea) y Saldo Acumulado (Barras)',
+        height=500,
+        margin=dict(l=20, r=20, t=50, b=20),
+        hovermode="x unified",
+        # Definimos el título del único Eje Y
+        yaxis_title="<b>Monto Total ($)</b>",
+        yaxis=dict(tickformat="$,.0f") # Formato de moneda para el eje Y
+    )
+
+    # Configurar el Eje X
+    fig_combined.update_xaxes(
+        title_text="Fecha de Reporte"
+    )
+    return fig_combined
+
+
+# --- GRÁFICO DE BARRAS: GASTO DE ADMINISTRACIÓN ---
+def admon_figure(df_admon, window=None):
+    with metrics.stage("figure"):
+        df_admon = window_frame(df_admon, window)
+        return _build_admon_figure(data_key(df_admon), df_admon)
+
+
+@st.cache_resource(ttl=FIGURE_CACHE_TTL, max_entries=FIGURE_CACHE_ENTRIES, show_spinner=False)
+def _build_admon_figure(key, _df_admon):
+    import plotly.graph_objects as go
+
+    df_admon = _df_admon
+    labels = len(df_admon) <= LABEL_POINTS
+    # El gasto es un flujo: al agregar se suma el periodo
+    bar_x, bar_y = bar_points(df_admon['report_date'], df_admon['admon_expenses'], 'sum')
+    fig_admon_expenses = go.Figure()
+    fig_admon_expenses.add_trace(go.Bar(
+        x=bar_x,
+        y=bar_y,
+        marker_color='rgba(192, 57, 43, 0.9)', # Rojo para gastos
+        opacity=0.9,
+        name='Gasto de Administración',
+        text=df_admon['admon_expenses'].map(format_currency) if labels else None, # Formatea los números con 2 decimales y separador de miles
+        textposition='outside' if labels else None, # Coloca el texto fuera de la barra (arriba)
+        hovertemplate=None if labels else HOVER_CURRENCY
+    ))
+    fig_admon_expenses.update_layout(
+        title_text='Gasto de Administración Mensual (Se observa el aumento del 60%)',
+        xaxis_title='Fecha de Reporte',
+        yaxis_title='Monto ($)',
+        height=400,
+        margin=dict(l=20, r=20, t=50, b=20)
+    )
+    return fig_admon_expenses
+
+
+# --- MAPA DE CALOR: DESVIACIONES DE CUOTAS ---
+def heatmap_figure(matrix, title, colorbar_title, colorscale='Reds', zmid=None):
+    with metrics.stage("figure"):
+        return _build_heatmap_figure(data_key(matrix), matrix, title, colorbar_title, colorscale, zmid)
+
+
+@st.cache_resource(ttl=FIGURE_CACHE_TTL, max_entries=FIGURE_CACHE_ENTRIES, show_spinner=False)
+def _build_heatmap_figure(key, _matrix, title, colorbar_title, colorscale, zmid):
+    import plotly.graph_objects as go
+
+    matrix = _matrix
+    fig_heatmap = go.Figure(go.Heatmap(
+        z=matrix.to_numpy(),
+        x=[str(column) for column in matrix.columns],
+        y=[str(row) for row in matrix.index],
+        colorscale=colorscale,
+        zmid=zmid,
+        colorbar=dict(title=colorbar_title),
+        hoverongaps=False,
+        hovertemplate='%{y}<br>%{x}: %{z:,.2f}<extra></extra>'
+    ))
+    fig_heatmap.update_layout(
+        title_text=title,
+        xaxis_title='Mes',
+        height=max(300, 28 * len(matrix.index) + 120),
+        margin=dict(l=20, r=20, t=50, b=20)
+    )
+    return fig_heatmap
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+# Reducción de series largas antes de enviarlas al navegador. Las funciones
+# devuelven índices de los puntos que se conservan, así la misma selección
+# sirve para fechas, valores y cualquier columna de hover.
+#   * lttb:   Largest-Triangle-Three-Buckets; conserva la forma de la línea
+#   * minmax: mínimo y máximo de cada tramo; conserva picos y caídas
+#   * aggregate: barras por día / semana / mes / trimestre / año, el periodo
+#                más fino que no pase de `max_buckets`
+MINMAX_FACTOR = 4  # en series muy largas, min-max preselecciona factor × n puntos para LTTB
+FREQUENCIES = ["D", "W", "MS", "QS", "YS"]
+
+
+def _as_float(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype("datetime64[ns]").astype(np.int64).astype(float)
+    return x.astype(float)
+
+
+def lttb(x, y, n):
+    size = len(y)
+    if n >= size or n < 3:
+        return np.arange(size)
+    x, y = _as_float(x), np.asarray(y, dtype=float)
+    # n - 2 tramos entre el primer y el último punto, que siempre se conservan
+    edges = np.linspace(1, size - 1, n - 1).astype(np.int64)
+    selected = np.empty(n, dtype=np.int64)
+    selected[0], selected[-1] = 0, size - 1
+    a = 0
+    for i in range(n - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else size
+        avg_x, avg_y = x[end:next_end].mean(), y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+
+def minmax(y, n):
+    size = len(y)
+    if n >= size:
+        return np.arange(size)
+    buckets = max(n // 2, 1)
+    edges = np.linspace(0, size, buckets + 1).astype(np.int64)
+    bucket = np.repeat(np.arange(buckets), np.diff(edges))
+    # Ordena por tramo y valor: el primero y el último de cada tramo son su
+    # mínimo y su máximo
+    order = np.lexsort((np.asarray(y, dtype=float), bucket))
+    return np.unique(np.r_[0, order[edges[:-1]], order[edges[1:] - 1], size - 1])
+
+
+def downsample(x, y, n):
+    size = len(y)
+    if n >= size:
+        return np.arange(size)
+    if size > MINMAX_FACTOR * n:
+        candidates = minmax(y, MINMAX_FACTOR * n)
+        return candidates[lttb(np.asarray(x)[candidates], np.asarray(y)[candidates], n)]
+    return lttb(x, y, n)
+
+
+# Serie por fecha agregada ("sum" para flujos, "last" para saldos)
+def aggregate(dates, values, how, max_buckets):
+    series = pd.Series(np.asarray(values, dtype=float), index=pd.DatetimeIndex(dates)).sort_index()
+    for freq in FREQUENCIES:
+        buckets = getattr(series.resample(freq), how)(min_count=1).dropna()
+        if len(buckets) <= max_buckets:
+            break
+    return buckets
@@ -0,0 +1,79 @@
+import pandas as pd
+
+from ledger import normalize_text
+
+# Detección de asientos repetidos sobre los movimientos de `ledger`. Todo se
+# resuelve con índices hash (groupby / duplicated de pandas) sobre llaves
+# normalizadas, así que el costo crece linealmente con el número de asientos:
+#   * espejo:    mismo mes, concepto y monto registrado como ingreso y egreso
+#                (p. ej. "DEVOLUCION DE PAGO JARDINERA" en Nov 2024)
+#   * duplicado: el mismo asiento (cuenta, fecha, tipo, concepto, monto) repetido
+#   * similar:   conceptos distintos del mismo mes con la misma firma de
+#                palabras (p. ej. "DEVOLUCION DE PAGO JARDINERA" y "JARDINERIA")
+FINDINGS = {
+    "espejo": "Registrado como ingreso y egreso en el mismo mes",
+    "duplicado": "Asiento repetido",
+    "similar": "Conceptos parecidos en el mismo mes",
+}
+
+# Palabras que no distinguen un concepto de otro
+STOPWORDS = {
+    "A", "AL", "CON", "DE", "DEL", "EL", "EN", "LA", "LAS", "LOS", "MES", "POR", "PARA", "Y",
+    "ABONO", "CARGO", "COBRO", "DEVOLUCION", "PAGO",
+}
+STEM = 6  # letras de cada palabra que entran en la firma
+
+COLUMNS = ["finding", "group", "condominium", "account", "period", "date", "kind", "concept", "amount"]
+
+
+def concept_key(concepts):
+    # Concepto en mayúsculas, sin acentos ni puntuación; se normaliza cada
+    # concepto distinto una sola vez y se reparte a los asientos por código.
+    codes, unique = pd.factorize(concepts)
+    keys = normalize_text(pd.Series(unique)).str.replace(r"[^A-Z0-9 ]", " ", regex=True).str.replace(r"\s+", " ", regex=True).str.strip()
+    return pd.Series(keys.to_numpy()[codes], index=concepts.index)
+
+
+def concept_signature(keys):
+    # Firma de palabras: raíces de las palabras significativas, sin orden ni
+    # repeticiones. Se calcula una vez por concepto distinto, no por asiento.
+    unique = pd.Series(keys.unique())
+    words = unique.str.split(" ").explode()
+    words = words[(words.str.len() >= 3) & ~words.isin(STOPWORDS) & ~words.str.isdigit()]
+    stems = words.str[:STEM].groupby(level=0).agg(lambda stem: " ".join(sorted(set(stem))))
+    signature = stems.reindex(unique.index).fillna("")
+    return keys.map(pd.Series(signature.to_numpy(), index=unique.to_numpy()))
+
+
+def _tag(rows, finding, group_keys):
+    group = rows.groupby(group_keys, sort=False).ngroup()
+    return rows.assign(finding=finding, group=finding + "-" + group.astype(str))
+
+
+def find_duplicates(movements):
+    items = movements[movements["kind"].isin(["ingreso", "egreso"])]
+    if items.empty:
+        return pd.DataFrame(columns=COLUMNS)
+    items = items.assign(key=concept_key(items["concept"]), cents=(items["amount"].abs() * 100).round().astype("int64"))
+    mirror_keys = ["condominium", "period", "key", "cents"]
+
+    # Espejo: la llave (mes, concepto, monto) aparece con ambos tipos
+    kinds = items.groupby(mirror_keys + ["kind"], sort=False).size().unstack("kind", fill_value=0)
+    both = kinds.reindex(columns=["ingreso", "egreso"], fill_value=0).gt(0).all(axis=1)
+    mirrored = items.join(both.rename("mirrored"), on=mirror_keys)
+    mirrored = _tag(mirrored[mirrored["mirrored"]], "espejo", mirror_keys)
+
+    # Duplicado exacto
+    exact_keys = ["condominium", "account", "date", "kind", "key", "cents"]
+    duplicated = _tag(items[items.duplicated(exact_keys, keep=False)], "duplicado", exact_keys)
+
+    # Similar: misma firma, distinto concepto normalizado
+    items = items.assign(signature=concept_signature(items["key"]))
+    items = items[items["signature"] != ""]
+    near_keys = ["condominium", "period", "signature"]
+    variants = items.drop_duplicates(near_keys + ["key"]).groupby(near_keys, sort=False).size()
+    similar = items.join(variants.rename("variants"), on=near_keys)
+    similar = _tag(similar[similar["variants"] > 1], "similar", near_keys)
+
+    found = pd.concat([mirrored, duplicated, similar], ignore_index=True)
+    return found.sort_values(["condominium", "period", "finding", "group", "date"], kind="stable").reset_index(drop=True)[COLUMNS]
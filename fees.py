@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+# Consistencia de cuotas sobre la relación de cargos por vecino (unidad × mes ×
+# concepto × monto). Para cada concepto y mes la cuota "oficial" es la moda de
+# lo cobrado a las unidades; las unidades que pagan otra cosa son atípicas.
+# `analyze_charges` corre en la ingesta (ver ledger) y deja dos tablas
+# pequeñas: la moda por concepto y mes, y sólo las filas atípicas. La app nunca
+# arma la tabla completa unidad × mes.
+TOLERANCE = 0.01  # pesos
+
+MODE_COLUMNS = ["condominium", "concept", "period", "modal_amount", "units", "outliers", "max_deviation"]
+DEVIATION_COLUMNS = ["condominium", "concept", "period", "unit", "amount", "modal_amount", "deviation"]
+
+
+def analyze_charges(charges, tolerance=TOLERANCE):
+    if charges.empty:
+        return pd.DataFrame(columns=MODE_COLUMNS), pd.DataFrame(columns=DEVIATION_COLUMNS)
+    keys = ["condominium", "concept", "period"]
+    # Una unidad puede tener varias líneas del mismo concepto en el mes
+    per_unit = charges.groupby(keys + ["unit"], observed=True, sort=False)["amount"].sum().reset_index()
+    per_unit["cents"] = (per_unit["amount"] * 100).round().astype("int64")
+
+    # Moda por grupo: el monto más frecuente; en empate, el menor
+    counts = per_unit.groupby(keys + ["cents"], observed=True, sort=False).size().rename("count").reset_index()
+    modal = (
+        counts.sort_values(["count", "cents"], ascending=[False, True], kind="stable")
+        .drop_duplicates(keys)
+        .assign(modal_amount=lambda frame: frame["cents"] / 100)[keys + ["modal_amount"]]
+    )
+
+    per_unit = per_unit.merge(modal, on=keys, how="left")
+    per_unit["deviation"] = per_unit["amount"] - per_unit["modal_amount"]
+    per_unit["abs_deviation"] = per_unit["deviation"].abs()
+    per_unit["outlier"] = per_unit["abs_deviation"] > tolerance
+
+    modes = per_unit.groupby(keys, observed=True).agg(
+        modal_amount=("modal_amount", "first"),
+        units=("unit", "size"),
+        outliers=("outlier", "sum"),
+        max_deviation=("abs_deviation", "max"),
+    ).reset_index()
+    deviations = per_unit.loc[per_unit["outlier"], DEVIATION_COLUMNS].reset_index(drop=True)
+    return modes[MODE_COLUMNS], deviations
+
+
+# Cambio de la cuota modal contra el mes anterior, por concepto. Sólo cuenta el
+# mes inmediato anterior: después de un mes sin cargos no hay comparación.
+def month_over_month(modes):
+    modes = modes.sort_values(["condominium", "concept", "period"], kind="stable").reset_index(drop=True)
+    starts = pd.to_datetime(modes["period"], format="%Y-%m")
+    month = starts.dt.year * 12 + starts.dt.month
+    groups = [modes["condominium"], modes["concept"]]
+    previous = modes.groupby(groups, sort=False)["modal_amount"].shift()
+    previous = previous.where(month - month.groupby(groups, sort=False).shift() == 1)
+    return modes.assign(
+        previous_amount=previous,
+        change=modes["modal_amount"] - previous,
+        change_pct=(modes["modal_amount"] - previous) / previous.replace(0, np.nan) * 100,
+    )
+
+
+# Resumen por concepto: estabilidad de la cuota y alcance de las diferencias
+def concept_overview(modes):
+    changes = month_over_month(modes)
+    changes = changes.assign(changed=changes["change"].abs() > TOLERANCE, outlier_month=changes["outliers"] > 0)
+    return changes.groupby(["condominium", "concept"], sort=False).agg(
+        months=("period", "size"),
+        modal_mean=("modal_amount", "mean"),
+        modal_variance=("modal_amount", "var"),
+        changes=("changed", "sum"),
+        outlier_months=("outlier_month", "sum"),
+        outlier_charges=("outliers", "sum"),
+    ).reset_index()
+
+
+# Matriz concepto × mes con la proporción de unidades que pagan distinto a la moda
+def outlier_matrix(modes):
+    share = modes.assign(share=modes["outliers"] / modes["units"] * 100)
+    return share.pivot_table(index="concept", columns="period", values="share", aggfunc="max")
+
+
+# Matriz unidad × mes con la diferencia contra la moda, sólo para unidades atípicas
+def deviation_matrix(deviations, concept):
+    rows = deviations[deviations["concept"] == concept]
+    return rows.pivot_table(index="unit", columns="period", values="deviation", aggfunc="sum")
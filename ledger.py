@@ -0,0 +1,434 @@
+import csv
+import hashlib
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+import alerts
+import fees
+import reconcile
+import store
+from store import DEFAULT_CONDOMINIUM, SOURCE_DIR, STORE_DIR
+
+# Los Estados Financieros exportados de Neivor (CSV o XLSX, uno por mes) se
+# dejan en SOURCE_DIR. `ingest()` los convierte a un almacén Parquet
+# particionado por mes en STORE_DIR y sólo vuelve a leer los archivos nuevos o
+# modificados (se detectan por su hash). La app lee el almacén con Arrow en
+# memoria mapeada, así que el arranque no crece con los años de historia.
+# Una exportación que no se puede leer no detiene la ingesta: su error queda en
+# el manifiesto (la página lo muestra) y se siguen sirviendo los datos que ya
+# había de ese archivo. No se vuelve a intentar hasta que el archivo cambia.
+# Si cambia el código que produce el almacén (store.CODE_FILES) se vuelven a
+# leer todas las fuentes, así los agregados nunca quedan de una versión vieja.
+BATCH_BYTES = 4 << 20  # tamaño de bloque al leer CSV
+BATCH_ROWS = 50_000  # filas por lote al leer XLSX
+
+# Encabezados de Neivor (sin acentos y en minúsculas) -> columnas internas
+HEADERS = {
+    "condominio": "condominium",
+    "cuenta": "account",
+    "fecha": "date",
+    "periodo": "date",
+    "concepto": "concept",
+    "tipo": "kind",
+    "monto": "amount",
+    "importe": "amount",
+    "unidad": "unit",
+}
+
+# Valores de la columna "Tipo" -> tipo de movimiento
+KINDS = {
+    "INGRESO": "ingreso",
+    "INGRESOS": "ingreso",
+    "EGRESO": "egreso",
+    "EGRESOS": "egreso",
+    "GASTO": "egreso",
+    "GASTOS": "egreso",
+    "SALDO INICIAL": "saldo_inicial",
+    "SALDO FINAL": "saldo_final",
+}
+
+# Un archivo con columna "Unidad" es la relación de cargos por vecino; el resto
+# son movimientos de las cuentas del condominio.
+SCHEMAS = {
+    "movements": pa.schema([
+        ("condominium", pa.string()),
+        ("account", pa.string()),
+        ("date", pa.date32()),
+        ("concept", pa.string()),
+        ("kind", pa.string()),
+        ("amount", pa.float64()),
+    ]),
+    "charges": pa.schema([
+        ("condominium", pa.string()),
+        ("unit", pa.string()),
+        ("date", pa.date32()),
+        ("concept", pa.string()),
+        ("amount", pa.float64()),
+    ]),
+}
+REQUIRED = {
+    "movements": {"date", "concept", "kind", "amount"},
+    "charges": {"unit", "date", "concept", "amount"},
+}
+
+MONTHLY_COLUMNS = ["condominium", "account", "period", "opening_balance", "total_incomes", "total_expenses", "ending_balance"]
+CONCEPT_COLUMNS = ["condominium", "period", "kind", "concept", "amount"]
+
+
+# Mayúsculas, sin acentos y con espacios simples; funciona sobre una Series.
+# Cada texto distinto se normaliza una sola vez y se reparte por código.
+def normalize_text(values):
+    codes, unique = pd.factorize(values.fillna("").astype(str))
+    text = (
+        pd.Series(unique, dtype=object)
+        .str.normalize("NFKD").str.encode("ascii", "ignore").str.decode("ascii")
+        .str.upper().str.replace(r"\s+", " ", regex=True).str.strip()
+    )
+    return pd.Series(text.to_numpy()[codes], index=values.index, dtype=object)
+
+
+def normalize_header(name):
+    return normalize_text(pd.Series([name]))[0].lower()
+
+
+# --- LECTURA POR LOTES ---
+def _csv_batches(path):
+    with open(path, newline="", encoding="utf-8-sig") as handle:
+        header = next(csv.reader(handle))
+    reader = pacsv.open_csv(
+        path,
+        read_options=pacsv.ReadOptions(block_size=BATCH_BYTES, encoding="utf-8-sig"),
+        convert_options=pacsv.ConvertOptions(column_types={name: pa.string() for name in header}),
+    )
+    for batch in reader:
+        yield batch.to_pandas()
+
+
+def _xlsx_batches(path):
+    try:
+        from openpyxl import load_workbook
+    except ImportError as exc:
+        raise RuntimeError(f"Para leer {path.name} se necesita openpyxl (pip install openpyxl)") from exc
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(cell) for cell in next(rows)]
+        chunk = []
+        for row in rows:
+            chunk.append(["" if cell is None else str(cell) for cell in row])
+            if len(chunk) == BATCH_ROWS:
+                yield pd.DataFrame(chunk, columns=header)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame(chunk, columns=header)
+    finally:
+        workbook.close()
+
+
+def _read_batches(path):
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        return _csv_batches(path)
+    if suffix in (".xlsx", ".xlsm"):
+        return _xlsx_batches(path)
+    raise ValueError(f"Formato no soportado: {path.name}")
+
+
+def _parse_amount(values):
+    text = values.fillna("").astype(str).str.strip()
+    negative = text.str.startswith("(") & text.str.endswith(")")
+    amount = pd.to_numeric(text.str.replace(r"[$,()\s]", "", regex=True), errors="coerce")
+    return amount.where(~negative, -amount)
+
+
+def _parse_date(values):
+    # Las fechas se repiten mucho dentro de un estado; se interpreta cada valor
+    # distinto una sola vez.
+    codes, unique = pd.factorize(values.fillna("").astype(str))
+    text = pd.Series(unique).str.strip().str.split(" ").str[0]
+    iso = pd.to_datetime(text, format="%Y-%m-%d", errors="coerce")
+    long_year = pd.to_datetime(text, format="%d/%m/%Y", errors="coerce")
+    short_year = pd.to_datetime(text, format="%d/%m/%y", errors="coerce")
+    # Un periodo sin día ("AAAA-MM", columna Periodo) cuenta como fin de mes
+    month = pd.to_datetime(text, format="%Y-%m", errors="coerce") + pd.offsets.MonthEnd(0)
+    parsed = iso.fillna(long_year).fillna(short_year).fillna(month)
+    return pd.Series(parsed.to_numpy()[codes], index=values.index)
+
+
+# Convierte un lote con encabezados de Neivor al esquema interno del dataset
+def _normalize(frame, dataset, source):
+    frame = frame.rename(columns={column: HEADERS.get(normalize_header(column), column) for column in frame.columns})
+    missing = REQUIRED[dataset] - set(frame.columns)
+    if missing:
+        raise ValueError(f"{source.name}: faltan las columnas {sorted(missing)}")
+
+    out = pd.DataFrame(index=frame.index)
+    out["condominium"] = frame["condominium"].fillna("").str.strip() if "condominium" in frame else ""
+    out.loc[out["condominium"] == "", "condominium"] = DEFAULT_CONDOMINIUM
+    if dataset == "movements":
+        out["account"] = frame["account"].fillna("").str.strip() if "account" in frame else ""
+    else:
+        out["unit"] = frame["unit"].fillna("").astype(str).str.strip()
+    out["date"] = _parse_date(frame["date"])
+    out["concept"] = frame["concept"].fillna("").astype(str).str.strip()
+    if dataset == "movements":
+        out["kind"] = normalize_text(frame["kind"]).map(KINDS)
+    out["amount"] = _parse_amount(frame["amount"])
+
+    invalid = out["date"].isna() | out["amount"].isna()
+    if dataset == "movements":
+        invalid |= out["kind"].isna()
+    if invalid.any():
+        row = frame.loc[invalid.idxmax()]
+        raise ValueError(f"{source.name}: fecha, tipo o monto no reconocidos en {row.to_dict()}")
+    codes, dates = pd.factorize(out["date"])
+    out["period"] = dates.strftime("%Y-%m").to_numpy()[codes]
+    out["date"] = out["date"].dt.date
+    return out
+
+
+def _detect_dataset(path):
+    for batch in _read_batches(path):
+        headers = {HEADERS.get(normalize_header(column)) for column in batch.columns}
+        return "charges" if "unit" in headers else "movements"
+    return "movements"
+
+
+# --- INGESTA INCREMENTAL ---
+def _remove_parts(store_dir, entry, changed, keep=()):
+    # `keep`: part-files recién escritos con el mismo nombre que uno anterior
+    for part in set(entry.get("parts", [])) - set(keep):
+        (store_dir / part).unlink(missing_ok=True)
+    if "dataset" in entry:
+        changed.setdefault(entry["dataset"], set()).update(entry["periods"])
+
+
+# Escribe un archivo fuente como un part-file por mes: <dataset>/period=YYYY-MM/<id>.parquet
+def _write_source(path, dataset, store_dir, part_id):
+    schema = SCHEMAS[dataset]
+    writers = {}
+    try:
+        for batch in _read_batches(path):
+            frame = _normalize(batch, dataset, path)
+            for period, rows in frame.groupby("period", sort=False):
+                if period not in writers:
+                    target = store_dir / dataset / f"period={period}" / f"{part_id}.parquet"
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    writers[period] = pq.ParquetWriter(target, schema)
+                table = pa.Table.from_pandas(rows[schema.names], schema=schema, preserve_index=False)
+                writers[period].write_table(table)
+    except Exception:
+        for writer in writers.values():
+            writer.close()
+        for period in writers:
+            (store_dir / dataset / f"period={period}" / f"{part_id}.parquet").unlink(missing_ok=True)
+        raise
+    for writer in writers.values():
+        writer.close()
+    periods = sorted(writers)
+    parts = [f"{dataset}/period={period}/{part_id}.parquet" for period in periods]
+    return periods, parts
+
+
+def ingest(source_dir=SOURCE_DIR, store_dir=STORE_DIR):
+    # Devuelve {dataset: [meses afectados]} para que los consumidores (agregados,
+    # alertas) sólo recalculen esos meses.
+    source_dir, store_dir = Path(source_dir), Path(store_dir)
+    store_dir.mkdir(parents=True, exist_ok=True)
+    code = store.code_digest()
+    previous = store.load_manifest(store_dir)
+    manifest = previous["sources"]
+    sources = store.list_sources(source_dir)
+    changed = {}
+
+    for name, path in sources.items():
+        entry = manifest.get(name)
+        stat = path.stat()
+        if previous["code"] == code and store.source_unchanged(path, entry):
+            entry.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            continue
+        digest = store.file_digest(path)
+        # Los part-files nuevos no pisan a los anteriores: si la lectura falla,
+        # los de la versión buena siguen en su lugar
+        part_id = hashlib.sha1(f"{name}:{digest}:{code}".encode()).hexdigest()[:16]
+        try:
+            dataset = _detect_dataset(path)
+            periods, parts = _write_source(path, dataset, store_dir, part_id)
+        except Exception as exc:
+            manifest[name] = {
+                **(entry or {}),
+                "sha256": digest,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "error": str(exc),
+            }
+            continue
+        if entry:
+            _remove_parts(store_dir, entry, changed, keep=parts)
+        manifest[name] = {
+            "sha256": digest,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "dataset": dataset,
+            "periods": periods,
+            "parts": parts,
+        }
+        changed.setdefault(dataset, set()).update(periods)
+
+    for name in sorted(set(manifest) - set(sources)):
+        _remove_parts(store_dir, manifest.pop(name), changed)
+
+    changed = {dataset: sorted(periods) for dataset, periods in changed.items()}
+    if "movements" in changed:
+        _refresh_aggregates(store_dir, changed["movements"])
+    if "charges" in changed:
+        _refresh_charge_aggregates(store_dir, changed["charges"])
+    store.save_manifest({"code": code, "sources": manifest}, store_dir)
+    return changed
+
+
+# --- AGREGADOS PRECALCULADOS ---
+def monthly_summary(movements):
+    # Saldos, ingresos y egresos por condominio, cuenta y mes
+    if movements.empty:
+        return pd.DataFrame(columns=MONTHLY_COLUMNS)
+    summary = (
+        movements.groupby(["condominium", "account", "period", "kind"], observed=True)["amount"]
+        .sum(min_count=1)
+        .unstack("kind")
+        .reindex(columns=["saldo_inicial", "ingreso", "egreso", "saldo_final"])
+        .rename(columns={
+            "saldo_inicial": "opening_balance",
+            "ingreso": "total_incomes",
+            "egreso": "total_expenses",
+            "saldo_final": "ending_balance",
+        })
+        .reset_index()
+    )
+    summary.columns.name = None
+    return summary[MONTHLY_COLUMNS]
+
+
+def concept_summary(movements):
+    # Total por concepto (normalizado) y mes; alimenta las gráficas por rubro
+    if movements.empty:
+        return pd.DataFrame(columns=CONCEPT_COLUMNS)
+    frame = movements.assign(concept=normalize_text(movements["concept"]))
+    return (
+        frame.groupby(["condominium", "period", "kind", "concept"], observed=True)["amount"]
+        .sum()
+        .reset_index()[CONCEPT_COLUMNS]
+    )
+
+
+def _replace_periods(path, fresh, periods):
+    if path.exists():
+        current = pq.read_table(path, memory_map=True).to_pandas()
+        current = current[~current["period"].isin(periods)]
+        fresh = pd.concat([current, fresh], ignore_index=True) if not fresh.empty else current
+    fresh = fresh.sort_values(list(fresh.columns[:3])).reset_index(drop=True)
+    pq.write_table(pa.Table.from_pandas(fresh, preserve_index=False), path)
+
+
+def _refresh_aggregates(store_dir, periods):
+    movements = read_movements(store_dir, periods)
+    aggregates = store_dir / "aggregates"
+    aggregates.mkdir(exist_ok=True)
+    _replace_periods(aggregates / "monthly.parquet", monthly_summary(movements), periods)
+    _replace_periods(aggregates / "concepts.parquet", concept_summary(movements), periods)
+    # La conciliación necesita el mes anterior, así que se evalúa sobre todo el
+    # resumen mensual (una fila por cuenta y mes) y se guarda como JSON para que
+    # la página la muestre sin cargar pandas.
+    discrepancies = reconcile.reconcile(read_monthly(store_dir))
+    discrepancies["description"] = discrepancies["check"].map(reconcile.CHECKS)
+    (aggregates / "discrepancies.json").write_text(discrepancies.to_json(orient="records", force_ascii=False))
+    alerts.refresh(store_dir, periods)
+
+
+# Moda por concepto y mes y filas atípicas de la relación de cargos (ver fees)
+def _refresh_charge_aggregates(store_dir, periods):
+    charges = read_charges(store_dir, periods)
+    charges = charges.assign(concept=normalize_text(charges["concept"]))
+    modes, deviations = fees.analyze_charges(charges)
+    aggregates = store_dir / "aggregates"
+    aggregates.mkdir(exist_ok=True)
+    _replace_periods(aggregates / "charge_modes.parquet", modes, periods)
+    _replace_periods(aggregates / "charge_deviations.parquet", deviations, periods)
+
+
+# --- LECTURA DEL ALMACÉN ---
+def _read_dataset(path, periods=None):
+    if not path.exists() or not any(path.iterdir()):
+        return None
+    filters = [("period", "in", list(periods))] if periods is not None else None
+    table = pq.read_table(path, partitioning="hive", memory_map=True, filters=filters)
+    frame = table.to_pandas()
+    frame["period"] = frame["period"].astype(str)
+    return frame
+
+
+def read_movements(store_dir=STORE_DIR, periods=None):
+    frame = _read_dataset(Path(store_dir) / "movements", periods)
+    if frame is None:
+        return pd.DataFrame(columns=SCHEMAS["movements"].names + ["period"])
+    return frame
+
+
+def read_charges(store_dir=STORE_DIR, periods=None):
+    frame = _read_dataset(Path(store_dir) / "charges", periods)
+    if frame is None:
+        return pd.DataFrame(columns=SCHEMAS["charges"].names + ["period"])
+    return frame
+
+
+def _read_aggregate(store_dir, name, columns):
+    path = Path(store_dir) / "aggregates" / f"{name}.parquet"
+    if not path.exists():
+        return pd.DataFrame(columns=columns)
+    return pq.read_table(path, memory_map=True).to_pandas()
+
+
+def read_monthly(store_dir=STORE_DIR):
+    return _read_aggregate(store_dir, "monthly", MONTHLY_COLUMNS)
+
+
+def read_concepts(store_dir=STORE_DIR):
+    return _read_aggregate(store_dir, "concepts", CONCEPT_COLUMNS)
+
+
+def read_charge_modes(store_dir=STORE_DIR):
+    return _read_aggregate(store_dir, "charge_modes", fees.MODE_COLUMNS)
+
+
+def read_charge_deviations(store_dir=STORE_DIR):
+    return _read_aggregate(store_dir, "charge_deviations", fees.DEVIATION_COLUMNS)
+
+
+# Último día del mes para cada periodo 'YYYY-MM'
+def period_end(periods):
+    return pd.to_datetime(periods, format="%Y-%m") + pd.offsets.MonthEnd(0)
+
+
+def reset_store(store_dir=STORE_DIR):
+    shutil.rmtree(store_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Ingesta de Estados Financieros de Neivor a Parquet")
+    parser.add_argument("--source", default=SOURCE_DIR, type=Path)
+    parser.add_argument("--store", default=STORE_DIR, type=Path)
+    parser.add_argument("--rebuild", action="store_true", help="borra el almacén y vuelve a ingerir todo")
+    args = parser.parse_args()
+    if args.rebuild:
+        reset_store(args.store)
+    for dataset, periods in ingest(args.source, args.store).items():
+        print(f"{dataset}: {len(periods)} meses actualizados ({', '.join(periods)})")
+    for name, message in store.ingest_errors(args.store).items():
+        print(f"ERROR {name}: {message}")
@@ -0,0 +1,252 @@
+import contextlib
+import json
+import os
+import pickle
+import statistics
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+# Instrumentación de render por sección. Con ALERTA_METRICS=1 cada ejecución del
+# script agrega al archivo JSONL una línea por sección con:
+#   * ms por etapa: prepare (datos), render (figuras y dibujo sobre el
+#     contenedor) y figure (construcción de la figura, incluida en render)
+#   * ms, cantidad y bytes por tipo de elemento (plotly_chart, markdown, ...);
+#     los bytes son los del ForwardMsg que Streamlit envía al navegador
+#   * RSS del proceso al terminar la sección y, la primera vez que la sesión
+#     la abre, el tamaño del payload que queda en session_state
+# y una línea "_total" por ejecución con la memoria retenida por la sesión.
+# Apagada (el valor por omisión) cada gancho regresa de inmediato: se puede
+# dejar en el código de producción sin costo.
+# Con `?metricas` en la URL se muestra al final de la página un expander con
+# percentiles de las últimas ejecuciones registradas.
+BASE_DIR = Path(__file__).resolve().parent
+ENABLED = os.environ.get("ALERTA_METRICS", "") not in ("", "0")
+METRICS_FILE = Path(os.environ.get("ALERTA_METRICS_FILE", BASE_DIR / "data" / "metrics.jsonl"))
+ADMIN_PARAM = "metricas"
+SUMMARY_LINES = 5000  # líneas recientes que entran en los percentiles
+
+_NULL = contextlib.nullcontext()
+# Streamlit ejecuta el script de cada sesión en su propio hilo
+_local = threading.local()
+_write_lock = threading.Lock()
+
+
+def _rss_bytes():
+    try:
+        with open("/proc/self/statm") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _payload_bytes(payload):
+    try:
+        return len(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return None
+
+
+def _new_record(section):
+    return {"section": section, "ms": 0.0, "stages": {}, "elements": {}, "bytes": 0}
+
+
+def _run():
+    return getattr(_local, "run", None)
+
+
+# Cuenta los bytes de cada mensaje que la sesión envía al navegador
+def _install_counter(ctx, run):
+    original = getattr(ctx, "_metrics_enqueue", None) or ctx._enqueue
+    ctx._metrics_enqueue = original
+
+    def enqueue(msg):
+        run["bytes"] += msg.ByteSize()
+        original(msg)
+
+    ctx._enqueue = enqueue
+
+
+def start_run(st):
+    if not ENABLED:
+        return
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    run = {
+        "session": ctx.session_id if ctx else "",
+        "run": st.session_state.get("_metricas_run", 0) + 1,
+        "started": time.perf_counter(),
+        "bytes": 0,
+        "records": [],
+        "current": None,
+    }
+    st.session_state["_metricas_run"] = run["run"]
+    if ctx is not None:
+        _install_counter(ctx, run)
+    _local.run = run
+
+
+@contextlib.contextmanager
+def _section(run, key):
+    record = _new_record(key)
+    run["current"] = record
+    started, sent = time.perf_counter(), run["bytes"]
+    try:
+        yield record
+    finally:
+        record["ms"] = (time.perf_counter() - started) * 1000
+        record["bytes"] = run["bytes"] - sent
+        record["rss_bytes"] = _rss_bytes()
+        run["records"].append(record)
+        run["current"] = None
+
+
+def section(key):
+    run = _run()
+    return _section(run, key) if run else _NULL
+
+
+@contextlib.contextmanager
+def _stage(record, name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record["stages"][name] = record["stages"].get(name, 0.0) + (time.perf_counter() - started) * 1000
+
+
+def stage(name):
+    run = _run()
+    if not run or run["current"] is None:
+        return _NULL
+    return _stage(run["current"], name)
+
+
+# Tamaño que el payload de una sección ocupa en session_state
+def payload(st, key, value):
+    run = _run()
+    if not run or run["current"] is None:
+        return
+    size = _payload_bytes(value)
+    run["current"]["payload_bytes"] = size
+    st.session_state.setdefault("_metricas_payload", {})[key] = size or 0
+
+
+class MeteredBox:
+    # Envuelve un contenedor de Streamlit: cada llamada a un elemento se cronometra
+    # y se le atribuyen los bytes enviados mientras corría.
+    def __init__(self, box, run):
+        self._box = box
+        self._run = run
+
+    def __getattr__(self, name):
+        attr = getattr(self._box, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            run = self._run
+            started, sent = time.perf_counter(), run["bytes"]
+            result = attr(*args, **kwargs)
+            record = run["current"]
+            if record is not None:
+                element = record["elements"].setdefault(name, {"count": 0, "ms": 0.0, "bytes": 0})
+                element["count"] += 1
+                element["ms"] += (time.perf_counter() - started) * 1000
+                element["bytes"] += run["bytes"] - sent
+            # Columnas y pestañas también se miden
+            if name in ("columns", "tabs"):
+                return [MeteredBox(child, run) for child in result]
+            return result
+
+        return call
+
+
+def meter(box):
+    run = _run()
+    return MeteredBox(box, run) if run else box
+
+
+def _write(lines):
+    METRICS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with _write_lock, open(METRICS_FILE, "a") as handle:
+        handle.write("".join(json.dumps(line, separators=(",", ":")) + "\n" for line in lines))
+
+
+def finish_run(st):
+    run = _run()
+    if not run:
+        return
+    _local.run = None
+    stamp = {"ts": round(time.time(), 3), "session": run["session"], "run": run["run"]}
+    total = _new_record("_total")
+    total.update(
+        ms=(time.perf_counter() - run["started"]) * 1000,
+        bytes=run["bytes"],
+        rss_bytes=_rss_bytes(),
+        session_bytes=sum(st.session_state.get("_metricas_payload", {}).values()),
+    )
+    _write([{**stamp, **record} for record in run["records"] + [total]])
+    if ADMIN_PARAM in st.query_params:
+        render_summary(st.expander("Métricas de render"))
+
+
+def read_metrics(path=METRICS_FILE, limit=SUMMARY_LINES):
+    path = Path(path)
+    if not path.exists():
+        return []
+    with open(path) as handle:
+        return [json.loads(line) for line in deque(handle, maxlen=limit)]
+
+
+def percentile(values, q):
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+# Percentiles por sección: tiempo total, etapas, bytes enviados y memoria
+def summarize(records):
+    by_section = {}
+    for record in records:
+        by_section.setdefault(record["section"], []).append(record)
+    rows = []
+    for key, group in by_section.items():
+        ms = [record["ms"] for record in group]
+        sent = [record["bytes"] for record in group]
+        prepare = [record["stages"]["prepare"] for record in group if "prepare" in record["stages"]]
+        rows.append({
+            "section": key,
+            "runs": len(group),
+            "p50_ms": percentile(ms, 50),
+            "p90_ms": percentile(ms, 90),
+            "p99_ms": percentile(ms, 99),
+            "prepare_p90_ms": percentile(prepare, 90) if prepare else None,
+            "p90_kb": percentile(sent, 90) / 1024,
+            "max_rss_mb": max(record.get("rss_bytes", 0) for record in group) / 2**20,
+        })
+    return sorted(rows, key=lambda row: row["p90_ms"], reverse=True)
+
+
+def render_summary(box):
+    rows = summarize(read_metrics())
+    if not rows:
+        box.info("Todavía no hay métricas registradas.")
+        return
+
+    def cell(value):
+        return "—" if value is None else f"{value:,.1f}"
+
+    lines = [
+        "| Sección | Ejecuciones | p50 ms | p90 ms | p99 ms | prepare p90 ms | p90 KB | RSS máx. MB |",
+        "|---|---:|---:|---:|---:|---:|---:|---:|",
+    ]
+    for row in rows:
+        values = [row[k] for k in ("p50_ms", "p90_ms", "p99_ms", "prepare_p90_ms", "p90_kb", "max_rss_mb")]
+        lines.append(f"| {row['section']} | {row['runs']} | " + " | ".join(map(cell, values)) + " |")
+    box.markdown("\n".join(lines))
+    box.caption(f"Últimas {SUMMARY_LINES:,} líneas de `{METRICS_FILE.name}`.")
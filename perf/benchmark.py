@@ -0,0 +1,324 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+# Banco de pruebas de la página completa sobre Estados Financieros sintéticos
+# (ver synthetic), desde el tamaño actual (9 y 18 meses, un condominio) hasta
+# 10 años × 50 condominios. Por escala mide:
+#   * ingest_ms:          ingesta desde cero (`python ledger.py`)
+#   * framework_import_ms: importar Streamlit (AppTest) en un proceso nuevo
+#   * cold_start_ms:      primera ejecución del script en ese proceso, con la
+#                         importación de los módulos de la app (el proceso no
+#                         importa ninguno antes de arrancar el reloj)
+#   * open_all_ms:        ejecución que abre todas las secciones
+#   * warm_rerun_*_ms:    ejecuciones siguientes con todo abierto (p50 y p90)
+#   * page_bytes y <elemento>_bytes: bytes enviados al navegador por ejecución con
+#                         todo abierto, por tipo de elemento (vía metrics)
+#   * session_mb:         payload que cada sesión guarda en session_state
+#   * server_rss_mb, session_rss_mb y concurrent_rerun_p90_ms: un servidor real
+#                         (`streamlit run`) con SESSIONS sesiones simultáneas por
+#                         websocket; la memoria por sesión es el aumento de RSS
+#                         del servidor dividido entre las sesiones
+# Los resultados se comparan contra benchmark_baseline.json; una métrica que pasa
+# su margen cuenta como regresión.
+#
+#   python perf/benchmark.py                   # todas las escalas contra la línea base
+#   python perf/benchmark.py --scales 9m 18m   # sólo algunas escalas
+#   python perf/benchmark.py --update          # mide y guarda la línea base
+BASE_DIR = Path(__file__).resolve().parent.parent
+BASELINE_FILE = Path(__file__).with_name("benchmark_baseline.json")
+sys.path.insert(0, str(BASE_DIR))
+
+SCALES = {
+    "9m": {"months": 9, "condominiums": 1},
+    "18m": {"months": 18, "condominiums": 1},
+    "5a_10": {"months": 60, "condominiums": 10},
+    "10a_50": {"months": 120, "condominiums": 50},
+}
+RERUNS = 10
+SESSIONS = 8
+SERVER_TIMEOUT = 60  # segundos para que el servidor responda
+
+# Margen sobre la línea base por tipo de métrica (sufijo del nombre): factor y
+# holgura absoluta, que absorbe el ruido en valores chicos (tiempos de decenas
+# de ms, memoria por sesión de menos de 1 MB)
+HEADROOM = {"_ms": (1.5, 50), "_bytes": (1.10, 0), "_mb": (1.25, 1)}
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 1)
+
+
+def _env(workdir, **extra):
+    return {
+        **os.environ,
+        "ALERTA_SOURCE_DIR": str(workdir / "fuente"),
+        "ALERTA_STORE_DIR": str(workdir / "parquet"),
+        **extra,
+    }
+
+
+# --- APPTEST (una sesión, proceso nuevo) ---
+def apptest_worker():
+    # El reloj arranca antes de cualquier importación: las miniaturas ya se
+    # generaron en otro proceso (ver measure) y los módulos de la app se
+    # importan dentro de la primera ejecución
+    started = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+
+    framework = time.perf_counter() - started
+    started = time.perf_counter()
+    at = AppTest.from_file(str(BASE_DIR / "casa107.py"), default_timeout=600).run()
+    cold = time.perf_counter() - started
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+
+    for toggle in at.toggle:
+        toggle.set_value(True)
+    started = time.perf_counter()
+    at.run()
+    open_all = time.perf_counter() - started
+
+    reruns = []
+    for _ in range(RERUNS):
+        started = time.perf_counter()
+        at.run()
+        reruns.append(_ms(time.perf_counter() - started))
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+
+    import metrics
+
+    # Bytes de la última ejecución, por tipo de elemento
+    records = metrics.read_metrics()
+    last = records[-1]["run"]
+    elements, total = {}, {}
+    for record in records:
+        if record["run"] != last:
+            continue
+        if record["section"] == "_total":
+            total = record
+        for name, element in record["elements"].items():
+            elements[f"{name}_bytes"] = elements.get(f"{name}_bytes", 0) + element["bytes"]
+    return {
+        "framework_import_ms": _ms(framework),
+        "cold_start_ms": _ms(cold),
+        "open_all_ms": _ms(open_all),
+        "warm_rerun_p50_ms": round(metrics.percentile(reruns, 50), 1),
+        "warm_rerun_p90_ms": round(metrics.percentile(reruns, 90), 1),
+        "page_bytes": total["bytes"],
+        "session_mb": round(total["session_bytes"] / 2**20, 3),
+        **elements,
+    }
+
+
+def run_apptest(workdir):
+    env = _env(workdir, ALERTA_METRICS="1", ALERTA_METRICS_FILE=str(workdir / "metrics.jsonl"))
+    out = subprocess.run(
+        [sys.executable, __file__, "--apptest"], cwd=BASE_DIR, env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+# --- CARGA (servidor real, varias sesiones) ---
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _rss_mb(pid):
+    with open(f"/proc/{pid}/statm") as handle:
+        return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def _wait_for(port):
+    deadline = time.monotonic() + SERVER_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"el servidor no respondió en {SERVER_TIMEOUT} s")
+
+
+class Session:
+    # Cliente mínimo del protocolo de Streamlit: pide una ejecución con ciertos
+    # valores de widgets y lee mensajes hasta `script_finished`.
+    def __init__(self, connection):
+        self.connection = connection
+        self.toggles = []
+
+    async def run(self, open_all=False):
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.page_script_hash = ""
+        if open_all:
+            for widget_id in self.toggles:
+                state = msg.rerun_script.widget_states.widgets.add()
+                state.id, state.bool_value = widget_id, True
+        started = time.perf_counter()
+        await self.connection.write_message(msg.SerializeToString(), binary=True)
+        received = 0
+        while True:
+            data = await self.connection.read_message()
+            if data is None:
+                raise RuntimeError("el servidor cerró la sesión")
+            received += len(data)
+            forward = ForwardMsg()
+            forward.ParseFromString(data)
+            kind = forward.WhichOneof("type")
+            if kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                element = forward.delta.new_element
+                if element.WhichOneof("type") == "checkbox" and element.checkbox.id not in self.toggles:
+                    self.toggles.append(element.checkbox.id)
+            if kind == "script_finished":
+                return time.perf_counter() - started, received
+
+
+async def _session(port, reruns):
+    from tornado.websocket import websocket_connect
+
+    connection = await websocket_connect(f"ws://127.0.0.1:{port}/_stcore/stream", max_message_size=512 * 2**20)
+    session = Session(connection)
+    await session.run()
+    await session.run(open_all=True)
+    times = [(await session.run(open_all=True))[0] for _ in range(reruns)]
+    return connection, times
+
+
+async def _load(port, pid, sessions, reruns):
+    from metrics import percentile
+
+    warmup, _ = await _session(port, 1)
+    baseline = _rss_mb(pid)
+    results = await asyncio.gather(*[_session(port, reruns) for _ in range(sessions)])
+    # Las sesiones siguen abiertas al medir: su session_state sigue en memoria
+    loaded = _rss_mb(pid)
+    for connection, _ in [(warmup, None), *results]:
+        connection.close()
+    times = [_ms(elapsed) for _, session_times in results for elapsed in session_times]
+    return {
+        "server_rss_mb": round(loaded, 1),
+        "session_rss_mb": round(max(loaded - baseline, 0) / sessions, 2),
+        "concurrent_rerun_p90_ms": round(percentile(times, 90), 1),
+    }
+
+
+def run_load(workdir, sessions):
+    port = _free_port()
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", str(BASE_DIR / "casa107.py"),
+            "--server.headless", "true", "--server.port", str(port),
+            "--browser.gatherUsageStats", "false",
+        ],
+        cwd=BASE_DIR, env=_env(workdir), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_for(port)
+        return asyncio.run(_load(port, server.pid, sessions, RERUNS))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+# --- ESCALAS ---
+def measure(scale, sessions):
+    import synthetic
+
+    workdir = Path(tempfile.mkdtemp(prefix=f"alerta-bench-{scale}-"))
+    try:
+        synthetic.write_ledgers(workdir / "fuente", **SCALES[scale])
+        started = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "ledger.py"], cwd=BASE_DIR, env=_env(workdir), check=True, capture_output=True
+        )
+        result = {"ingest_ms": _ms(time.perf_counter() - started)}
+        # En producción las miniaturas ya existen; no entran en el arranque
+        subprocess.run(
+            [sys.executable, "-c", "import assets, sections; assets.build_all(sections.IMAGES)"],
+            cwd=BASE_DIR, env=_env(workdir), check=True, capture_output=True,
+        )
+        result.update(run_apptest(workdir))
+        result.update(run_load(workdir, sessions))
+        return result
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _limit(name, base):
+    for suffix, (factor, slack) in HEADROOM.items():
+        if name.endswith(suffix):
+            return base * factor + slack
+    return None
+
+
+def compare(results, baseline):
+    regressions = []
+    for scale, metrics in results.items():
+        reference = baseline.get("scales", {}).get(scale)
+        if reference is None:
+            print(f"{scale}: sin línea base")
+            continue
+        for name, value in metrics.items():
+            base = reference.get(name)
+            limit = _limit(name, base) if base is not None else None
+            if limit is not None and value > limit:
+                regressions.append(f"{scale}.{name}: {value:,} > {limit:,.1f} (base {base:,})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Banco de pruebas de la página con datos sintéticos")
+    parser.add_argument("--scales", nargs="+", choices=SCALES, default=list(SCALES))
+    parser.add_argument("--sessions", type=int, default=SESSIONS)
+    parser.add_argument("--update", action="store_true", help="guarda la medición como nueva línea base")
+    parser.add_argument("--apptest", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.apptest:
+        print(json.dumps(apptest_worker()))
+        return 0
+
+    results = {}
+    for scale in args.scales:
+        results[scale] = measure(scale, args.sessions)
+        print(f"{scale}: " + ", ".join(f"{name}={value:,}" for name, value in results[scale].items()))
+
+    if args.update:
+        baseline = json.loads(BASELINE_FILE.read_text()) if BASELINE_FILE.exists() else {"scales": {}}
+        baseline["scales"].update(results)
+        baseline.update(python=platform.python_version(), machine=platform.machine(), sessions=args.sessions)
+        BASELINE_FILE.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"línea base guardada en {BASELINE_FILE.name}")
+        return 0
+
+    if not BASELINE_FILE.exists():
+        print("ERROR: no hay línea base; córrelo con --update")
+        return 1
+    regressions = compare(results, json.loads(BASELINE_FILE.read_text()))
+    for regression in regressions:
+        print(f"REGRESIÓN {regression}")
+    if regressions:
+        return 1
+    print("sin regresiones contra la línea base")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
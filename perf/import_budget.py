@@ -0,0 +1,117 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Presupuesto de tiempo de importación del arranque en frío. Mide, en procesos
+# nuevos, lo que la página importa antes de la primera pintura y falla si se
+# pasa del presupuesto guardado en import_budget.json o si alguno de los
+# módulos diferidos (pandas, pyarrow) se cuela en el arranque.
+# data/parquet/ no se versiona: en un contenedor nuevo la primera ejecución del
+# script ingiere todo (y carga pandas y pyarrow) antes de pintar. La segunda
+# medición es esa ejecución (AppTest, proceso nuevo, almacén vacío), con su
+# propio presupuesto; en producción se evita ingiriendo al desplegar.
+#
+#   python perf/import_budget.py           # compara contra el presupuesto
+#   python perf/import_budget.py --update  # vuelve a medir y guarda el presupuesto
+BASE_DIR = Path(__file__).resolve().parent.parent
+BUDGET_FILE = Path(__file__).with_name("import_budget.json")
+
+FIRST_PAINT = ["streamlit", "store", "assets", "charts", "sections"]
+DEFERRED = ["pandas", "pyarrow", "pyarrow.parquet", "openpyxl"]
+HEADROOM = 1.5  # margen sobre la mediana medida al fijar el presupuesto
+
+PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+for name in {FIRST_PAINT!r}:
+    __import__(name)
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({{"ms": elapsed, "loaded": [m for m in {DEFERRED!r} if m in sys.modules]}}))
+"""
+
+EMPTY_STORE_PROBE = f"""
+import json, time
+from streamlit.testing.v1 import AppTest
+start = time.perf_counter()
+at = AppTest.from_file({str(BASE_DIR / "casa107.py")!r}, default_timeout=600).run()
+elapsed = (time.perf_counter() - start) * 1000
+if at.exception:
+    raise SystemExit(at.exception[0].value)
+print(json.dumps({{"ms": elapsed}}))
+"""
+
+
+def _probe(code, env=None):
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=BASE_DIR, env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def measure(runs):
+    samples, loaded = [], set()
+    for _ in range(runs):
+        result = _probe(PROBE)
+        samples.append(result["ms"])
+        loaded.update(result["loaded"])
+    return statistics.median(samples), sorted(loaded)
+
+
+# Primera ejecución del script con un almacén vacío (ingesta incluida)
+def measure_empty_store(runs):
+    samples = []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory(prefix="alerta-parquet-") as store_dir:
+            samples.append(_probe(EMPTY_STORE_PROBE, {**os.environ, "ALERTA_STORE_DIR": store_dir})["ms"])
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Presupuesto de tiempo de importación del arranque")
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--update", action="store_true", help="guarda la medición como nuevo presupuesto")
+    args = parser.parse_args()
+
+    median, loaded = measure(args.runs)
+    print(f"arranque: {median:.0f} ms (mediana de {args.runs})")
+    if loaded:
+        print(f"ERROR: módulos diferidos importados en el arranque: {', '.join(loaded)}")
+        return 1
+    empty_store = measure_empty_store(args.runs)
+    print(f"primera ejecución con el almacén vacío: {empty_store:.0f} ms (mediana de {args.runs}, ingesta incluida)")
+
+    if args.update:
+        budget = {
+            "first_paint_ms": round(median * HEADROOM),
+            "measured_ms": round(median),
+            "empty_store_ms": round(empty_store * HEADROOM),
+            "measured_empty_store_ms": round(empty_store),
+            "modules": FIRST_PAINT,
+            "deferred": DEFERRED,
+        }
+        BUDGET_FILE.write_text(json.dumps(budget, indent=2) + "\n")
+        print(f"presupuesto guardado: {budget['first_paint_ms']} ms y {budget['empty_store_ms']} ms con el almacén vacío")
+        return 0
+
+    budget = json.loads(BUDGET_FILE.read_text())
+    failed = False
+    for label, value, limit in [
+        ("arranque", median, budget["first_paint_ms"]),
+        ("almacén vacío", empty_store, budget["empty_store_ms"]),
+    ]:
+        if value > limit:
+            print(f"ERROR: {label}: {value:.0f} ms supera el presupuesto de {limit} ms")
+            failed = True
+    if failed:
+        return 1
+    print(f"dentro del presupuesto ({budget['first_paint_ms']} ms y {budget['empty_store_ms']} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
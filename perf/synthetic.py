@@ -0,0 +1,70 @@
+import csv
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Estados Financieros sintéticos con la forma de las exportaciones de Neivor:
+# un CSV de movimientos y uno de cargos por vecino por mes, con todos los
+# condominios. El primer condominio es el que muestra la página
+# (store.DEFAULT_CONDOMINIUM) para que las secciones tengan datos. Los saldos
+# cuadran mes a mes salvo los errores que se siembran a propósito, así la
+# conciliación, las alertas y el detector de duplicados tienen trabajo.
+LAST_PERIOD = "2025-05"
+EXPENSES = {"ADMINISTRACION": 6000, "JARDINERIA": 3500, "VIGILANCIA": 28000, "LUZ AREAS COMUNES": 2500, "AGUA": 1800}
+FEES = {"CUOTA DE MANTENIMIENTO": 1500, "FONDO DE RESERVA": 200}
+ERROR_RATE = 0.02  # meses con saldo que no cuadra o asiento duplicado
+
+
+def condominium_names(count, first):
+    return [first] + [f"Condominio {number:02d}" for number in range(2, count + 1)]
+
+
+def periods(months, last=LAST_PERIOD):
+    return [str(period) for period in pd.period_range(end=last, periods=months, freq="M")]
+
+
+def _write(path, header, rows):
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def write_ledgers(source_dir, months, condominiums, units=40, first="Privada Parma", seed=0):
+    rng = np.random.default_rng(seed)
+    source_dir = Path(source_dir)
+    source_dir.mkdir(parents=True, exist_ok=True)
+    names = condominium_names(condominiums, first)
+    balances = {name: float(rng.uniform(50_000, 150_000)) for name in names}
+    fees = {name: {concept: amount * rng.uniform(0.8, 1.5) for concept, amount in FEES.items()} for name in names}
+    for index, period in enumerate(periods(months)):
+        day = pd.Period(period, freq="M")
+        first_day, last_day = day.start_time.strftime("%d/%m/%Y"), day.end_time.strftime("%d/%m/%Y")
+        movements, charges = [], []
+        for name in names:
+            opening = balances[name]
+            movements.append([name, "BANCO", first_day, "SALDO INICIAL", "Saldo inicial", f"{opening:.2f}"])
+            incomes = 0.0
+            for concept, amount in fees[name].items():
+                paid = rng.binomial(units, 0.9)
+                incomes += paid * round(amount, 2)
+                movements.append([name, "BANCO", first_day, concept, "Ingreso", f"{paid * round(amount, 2):.2f}"])
+                for unit in range(1, units + 1):
+                    charged = round(amount, 2) if rng.random() > 0.03 else round(amount * 1.1, 2)
+                    charges.append([name, f"U-{unit:03d}", first_day, concept, f"{charged:.2f}"])
+            expenses = 0.0
+            for concept, amount in EXPENSES.items():
+                # El costo de administración sube a mitad de la historia
+                spent = round(amount * (1.75 if concept == "ADMINISTRACION" and index >= months // 2 else 1) * rng.uniform(0.9, 1.1), 2)
+                expenses += spent
+                movements.append([name, "BANCO", last_day, concept, "Egreso", f"{spent:.2f}"])
+            if rng.random() < ERROR_RATE:
+                movements.append(movements[-1])  # asiento duplicado
+            ending = opening + incomes - expenses
+            reported = ending + (rng.uniform(100, 5_000) if rng.random() < ERROR_RATE else 0)
+            movements.append([name, "BANCO", last_day, "SALDO FINAL", "Saldo final", f"{reported:.2f}"])
+            balances[name] = reported
+        _write(source_dir / f"estado_{period}.csv", ["Condominio", "Cuenta", "Fecha", "Concepto", "Tipo", "Monto"], movements)
+        _write(source_dir / f"cargos_{period}.csv", ["Condominio", "Unidad", "Fecha", "Concepto", "Monto"], charges)
+    return names
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+# Conciliación mes a mes sobre el resumen mensual de `ledger` (una fila por
+# condominio, cuenta y mes). Dos comprobaciones, vectorizadas sobre todo el
+# libro de una sola vez:
+#   * continuidad: el saldo inicial del mes t es el saldo final del mes t-1
+#   * cuadratura:  saldo inicial + ingresos - egresos = saldo final
+# Los meses sin saldo inicial o final reportado no se evalúan.
+TOLERANCE = 0.01  # pesos; diferencias de redondeo
+
+CHECKS = {
+    "continuidad": "El saldo inicial no coincide con el saldo final del mes anterior",
+    "cuadratura": "Saldo inicial + ingresos - egresos no da el saldo final",
+}
+COLUMNS = ["condominium", "account", "period", "check", "expected", "reported", "difference"]
+
+
+def reconcile(monthly, tolerance=TOLERANCE):
+    if monthly.empty:
+        return pd.DataFrame(columns=COLUMNS)
+    ledger = monthly.sort_values(["condominium", "account", "period"], kind="stable").reset_index(drop=True)
+    starts = pd.to_datetime(ledger["period"], format="%Y-%m")
+    month = starts.dt.year.to_numpy() * 12 + starts.dt.month.to_numpy()
+    opening = ledger["opening_balance"].to_numpy(dtype=float)
+    incomes = ledger["total_incomes"].to_numpy(dtype=float)
+    expenses = ledger["total_expenses"].to_numpy(dtype=float)
+    ending = ledger["ending_balance"].to_numpy(dtype=float)
+
+    # Mes anterior de la misma cuenta; sólo cuenta si es exactamente t-1
+    group = ledger.groupby(["condominium", "account"], sort=False).ngroup().to_numpy()
+    same_account = np.r_[False, group[1:] == group[:-1]]
+    consecutive = same_account & np.r_[False, month[1:] - month[:-1] == 1]
+    previous_ending = np.r_[np.nan, ending[:-1]]
+
+    continuity = opening - previous_ending
+    continuity_mask = consecutive & (np.abs(continuity) > tolerance)
+
+    expected_ending = opening + np.nan_to_num(incomes) - np.nan_to_num(expenses)
+    balance = ending - expected_ending
+    balance_mask = np.abs(balance) > tolerance  # NaN (sin saldos) nunca marca
+
+    keys = ledger[["condominium", "account", "period"]]
+    found = pd.concat([
+        keys[continuity_mask].assign(
+            check="continuidad",
+            expected=previous_ending[continuity_mask],
+            reported=opening[continuity_mask],
+            difference=continuity[continuity_mask],
+        ),
+        keys[balance_mask].assign(
+            check="cuadratura",
+            expected=expected_ending[balance_mask],
+            reported=ending[balance_mask],
+            difference=balance[balance_mask],
+        ),
+    ], ignore_index=True)
+    return found.sort_values(["condominium", "period", "account", "check"], kind="stable").reset_index(drop=True)[COLUMNS]
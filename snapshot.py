@@ -0,0 +1,355 @@
+import argparse
+import hashlib
+import html
+import json
+import shutil
+import sys
+import textwrap
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from streamlit.logger import set_log_level
+
+# Fuera de `streamlit run` cada caché de Streamlit avisa al declararse; hay que
+# bajar el nivel antes de importar `sections`
+set_log_level("error")
+
+import assets  # noqa: E402
+import sections  # noqa: E402
+import store  # noqa: E402
+
+# Versión estática del informe para repartir por WhatsApp: se renderiza una sola
+# vez con las mismas funciones de `sections` que usa la app, pero sobre
+# `HtmlBox` en lugar de Streamlit. El resultado es una carpeta que cualquier
+# servidor de archivos puede servir:
+#   index.html                 el informe (sin caché, revalidado por ETag)
+#   figures/<hash>.json        cada figura de Plotly, cargada al abrir su sección
+#   plotly-<versión>.min.js    plotly.js, sólo se descarga si se abre una gráfica
+#   app/static/assets/*.webp   imágenes optimizadas (misma ruta que en la app)
+#   manifest.json              ETag (sha256) de cada archivo y la huella de entrada
+#   _headers                   Cache-Control para hosts estáticos (Netlify, Cloudflare)
+# Sólo se regenera cuando cambia la huella: datos del almacén, código de las
+# secciones o imágenes.
+BASE_DIR = Path(__file__).resolve().parent
+DIST_DIR = BASE_DIR / "dist"
+PAGE_TITLE = "Control Ciudadano Condominio"
+
+# Archivos cuyo contenido define el informe además de los datos
+SOURCE_FILES = ["sections.py", "charts.py", "assets.py", "alerts.py", "ledger.py", "duplicates.py", "fees.py", "downsample.py", "snapshot.py"]
+
+CALLOUTS = {"warning": "⚠️", "error": "🛑", "info": "ℹ️", "success": "✅"}
+
+
+def _markdown(text):
+    import markdown
+
+    # st.markdown quita la sangría común; aquí igual
+    return markdown.markdown(textwrap.dedent(text).strip(), extensions=["tables", "sane_lists"])
+
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class Bundle:
+    def __init__(self, root):
+        self.root = Path(root)
+        self.figures = 0
+
+    def write(self, relative, data):
+        path = self.root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        return relative
+
+    def add_figure(self, fig):
+        data = fig.to_json().encode()
+        self.figures += 1
+        return self.write(f"figures/{_digest(data)[:16]}.json", data)
+
+
+# Misma interfaz que un contenedor de Streamlit, pero acumula HTML
+class HtmlBox:
+    def __init__(self, bundle):
+        self.bundle = bundle
+        self.parts = []
+
+    def html(self):
+        return "\n".join(map(str, self.parts))
+
+    def title(self, body):
+        self.parts.append(f"<h1>{html.escape(body)}</h1>")
+
+    def subheader(self, body):
+        self.parts.append(_markdown(f"### {body}"))
+
+    def markdown(self, body, unsafe_allow_html=False):
+        self.parts.append(_markdown(body))
+
+    def divider(self):
+        self.parts.append("<hr>")
+
+    def _callout(self, kind, body, icon):
+        icon = icon or CALLOUTS[kind]
+        self.parts.append(f'<div class="callout {kind}"><span class="icon">{icon}</span><div>{_markdown(body)}</div></div>')
+
+    def warning(self, body, icon=None):
+        self._callout("warning", body, icon)
+
+    def error(self, body, icon=None):
+        self._callout("error", body, icon)
+
+    def info(self, body, icon=None):
+        self._callout("info", body, icon)
+
+    def success(self, body, icon=None):
+        self._callout("success", body, icon)
+
+    def plotly_chart(self, fig, **kwargs):
+        src = self.bundle.add_figure(fig)
+        self.parts.append(f'<div class="plotly-figure" data-src="{src}"></div>')
+
+    def dataframe(self, data, **kwargs):
+        import charts
+
+        formatters = {column: charts.format_currency for column in data.select_dtypes("float").columns}
+        self.parts.append(data.to_html(index=False, border=0, classes="table", formatters=formatters, na_rep="—"))
+
+    def columns(self, spec):
+        count = spec if isinstance(spec, int) else len(spec)
+        children = [HtmlBox(self.bundle) for _ in range(count)]
+        self.parts.append(_Deferred(lambda: '<div class="columns">' + "".join(
+            f'<div class="column">{child.html()}</div>' for child in children
+        ) + "</div>"))
+        return children
+
+    # Sin interacción: la versión estática muestra la primera opción
+    def selectbox(self, label, options, **kwargs):
+        options = list(options)
+        if options:
+            self.parts.append(f'<p class="caption">{html.escape(label)}: <b>{html.escape(str(options[0]))}</b></p>')
+        return options[0] if options else None
+
+    # El informe estático muestra el periodo completo; el acercamiento se hace en
+    # la propia gráfica
+    def slider(self, label, **kwargs):
+        return kwargs.get("value")
+
+
+# Columnas: su contenido se llena después de crearlas
+class _Deferred:
+    def __init__(self, render):
+        self.render = render
+
+    def __str__(self):
+        return self.render()
+
+
+# --- HUELLA DE ENTRADA ---
+def fingerprint(base_dir=BASE_DIR):
+    digest = hashlib.sha256(sections.refresh_store().encode())
+    for name in SOURCE_FILES:
+        digest.update((Path(base_dir) / name).read_bytes())
+    for name in sections.IMAGES:
+        digest.update(store.file_digest(assets.require(name, base_dir)).encode())
+    return digest.hexdigest()
+
+
+# --- RENDER ---
+def render(bundle):
+    body = HtmlBox(bundle)
+    sections.render_header(body)
+    version = sections.refresh_store()
+    sections.render_ingest_errors(body, sections.ingest_errors(version))
+    sections.render_discrepancies(body, sections.discrepancy_records(version))
+    for section in sections.SECTIONS:
+        box = HtmlBox(bundle)
+        section.render(box, section.prepare() if section.prepare else None)
+        body.parts.append(
+            f'<details id="{section.key}"><summary>{html.escape(section.title)}</summary>'
+            f'<div class="section">{box.html()}</div></details>'
+        )
+    sections.render_conclusion(body)
+    return body.html()
+
+
+def _plotly_js(bundle):
+    import plotly
+    from plotly.offline import get_plotlyjs
+
+    return bundle.write(f"plotly-{plotly.__version__}.min.js", get_plotlyjs().encode())
+
+
+def _copy_images(bundle):
+    manifest = sections.asset_manifest()
+    target = bundle.root / "app" / "static" / "assets"
+    target.mkdir(parents=True, exist_ok=True)
+    for asset in manifest.values():
+        for name in [asset["full"], *asset["thumbnails"].values()]:
+            shutil.copy2(assets.STATIC_DIR / name, target / name)
+
+
+PAGE = """<!doctype html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+<style>
+body {{ font-family: system-ui, sans-serif; max-width: 1100px; margin: 0 auto; padding: 1rem; line-height: 1.5; color: #262730; }}
+details {{ border: 1px solid #ddd; border-radius: .5rem; margin: .5rem 0; }}
+summary {{ cursor: pointer; padding: .75rem 1rem; font-weight: 600; }}
+.section {{ padding: 0 1rem 1rem; }}
+.callout {{ display: flex; gap: .75rem; padding: .75rem 1rem; border-radius: .5rem; margin: .75rem 0; }}
+.callout p {{ margin: 0; }}
+.warning {{ background: #fffce7; color: #926c05; }}
+.error {{ background: #ffecec; color: #7d353b; }}
+.info {{ background: #e8f3ff; color: #0d4a8b; }}
+.success {{ background: #e8f9ee; color: #177233; }}
+.columns {{ display: flex; flex-wrap: wrap; gap: 1rem; }}
+.column {{ flex: 1 1 300px; }}
+.table, table {{ border-collapse: collapse; width: 100%; font-size: .875rem; overflow-x: auto; display: block; }}
+th, td {{ border-bottom: 1px solid #eee; padding: .25rem .5rem; text-align: left; }}
+.plotly-figure {{ min-height: 400px; }}
+.caption {{ font-size: .875rem; opacity: .7; }}
+</style>
+</head>
+<body>
+{body}
+<p class="caption">Versión estática generada a partir de los Estados Financieros ({version}).</p>
+<script>
+// Las gráficas (y plotly.js) se descargan sólo al abrir su sección
+let plotly = null;
+function loadPlotly() {{
+  plotly = plotly || new Promise((resolve, reject) => {{
+    const script = document.createElement("script");
+    script.src = "{plotly_js}";
+    script.onload = () => resolve(window.Plotly);
+    script.onerror = reject;
+    document.head.appendChild(script);
+  }});
+  return plotly;
+}}
+async function drawFigures(root) {{
+  const pending = root.querySelectorAll(".plotly-figure:not([data-drawn])");
+  if (!pending.length) return;
+  const Plotly = await loadPlotly();
+  for (const div of pending) {{
+    div.dataset.drawn = "1";
+    const fig = await (await fetch(div.dataset.src)).json();
+    Plotly.newPlot(div, fig.data, fig.layout, {{responsive: true}});
+  }}
+}}
+document.querySelectorAll("details").forEach((section) => {{
+  section.addEventListener("toggle", () => section.open && drawFigures(section));
+}});
+</script>
+</body>
+</html>
+"""
+
+HEADERS = """/index.html
+  Cache-Control: no-cache
+/
+  Cache-Control: no-cache
+/manifest.json
+  Cache-Control: no-cache
+/figures/*
+  Cache-Control: public, max-age=31536000, immutable
+/app/static/assets/*
+  Cache-Control: public, max-age=31536000, immutable
+/plotly-*
+  Cache-Control: public, max-age=31536000, immutable
+"""
+
+
+def build(dist_dir=DIST_DIR, force=False):
+    dist_dir = Path(dist_dir)
+    sections.refresh_store()  # la huella debe ver el almacén ya actualizado
+    inputs = fingerprint()
+    previous = dist_dir / "manifest.json"
+    if not force and previous.exists() and json.loads(previous.read_text()).get("fingerprint") == inputs:
+        return False
+
+    staging = dist_dir.with_name(f".{dist_dir.name}.tmp")
+    shutil.rmtree(staging, ignore_errors=True)
+    bundle = Bundle(staging)
+    body = render(bundle)
+    plotly_js = _plotly_js(bundle)
+    _copy_images(bundle)
+    bundle.write("index.html", PAGE.format(
+        title=html.escape(PAGE_TITLE),
+        body=body,
+        version=store.version()[:12] or "sin datos",
+        plotly_js=plotly_js,
+    ).encode())
+    bundle.write("_headers", HEADERS.encode())
+
+    etags = {
+        path.relative_to(staging).as_posix(): _digest(path.read_bytes())[:32]
+        for path in sorted(staging.rglob("*")) if path.is_file()
+    }
+    bundle.write("manifest.json", json.dumps({"fingerprint": inputs, "etags": etags}, indent=1).encode())
+
+    # Reemplazo de la carpeta completa: nunca se sirve un bundle a medias
+    old = dist_dir.with_name(f".{dist_dir.name}.old")
+    shutil.rmtree(old, ignore_errors=True)
+    if dist_dir.exists():
+        dist_dir.rename(old)
+    staging.rename(dist_dir)
+    shutil.rmtree(old, ignore_errors=True)
+    return True
+
+
+# --- SERVIDOR DE PRUEBA CON ETAG ---
+def serve(dist_dir=DIST_DIR, port=8000):
+    dist_dir = Path(dist_dir)
+
+    class Handler(SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=str(dist_dir), **kwargs)
+
+        def _etag(self):
+            etags = json.loads((dist_dir / "manifest.json").read_text())["etags"]
+            path = self.path.split("?", 1)[0].lstrip("/") or "index.html"
+            return path, etags.get(path)
+
+        def send_head(self):
+            path, etag = self._etag()
+            if etag and self.headers.get("If-None-Match") == f'"{etag}"':
+                self.send_response(304)
+                self.end_headers()
+                return None
+            return super().send_head()
+
+        def end_headers(self):
+            path, etag = self._etag()
+            if etag:
+                self.send_header("ETag", f'"{etag}"')
+                immutable = path.startswith(("figures/", "app/static/assets/", "plotly-"))
+                self.send_header("Cache-Control", "public, max-age=31536000, immutable" if immutable else "no-cache")
+            super().end_headers()
+
+    ThreadingHTTPServer(("", port), Handler).serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera la versión estática del informe")
+    parser.add_argument("--out", default=DIST_DIR, type=Path)
+    parser.add_argument("--force", action="store_true", help="regenera aunque los datos no hayan cambiado")
+    parser.add_argument("--serve", action="store_true", help="sirve la carpeta generada con ETags")
+    parser.add_argument("--port", default=8000, type=int)
+    args = parser.parse_args()
+
+    if build(args.out, args.force):
+        print(f"informe estático generado en {args.out}")
+    else:
+        print("sin cambios en los datos; se conserva el informe existente")
+    if args.serve:
+        print(f"sirviendo {args.out} en http://localhost:{args.port}")
+        serve(args.out, args.port)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+# Ubicación y manifiesto del almacén Parquet. Este módulo sólo usa la
+# biblioteca estándar: la página puede saber si el almacén está al día y
+# mostrar el panel de discrepancias sin importar pandas ni pyarrow, que se
+# cargan (vía `ledger`) hasta que hace falta ingerir o abrir una sección con
+# datos.
+BASE_DIR = Path(__file__).resolve().parent
+SOURCE_DIR = Path(os.environ.get("ALERTA_SOURCE_DIR", BASE_DIR / "data" / "estados_financieros"))
+STORE_DIR = Path(os.environ.get("ALERTA_STORE_DIR", BASE_DIR / "data" / "parquet"))
+
+DEFAULT_CONDOMINIUM = "Privada Parma"
+SOURCE_SUFFIXES = (".csv", ".xlsx", ".xlsm")
+
+# Módulos que producen el almacén (lectura, agregados, conciliación, análisis de
+# cuotas). Su huella
+# se guarda en el manifiesto: si el código cambia, lo ingerido con la versión
+# anterior deja de estar al día y se vuelve a ingerir todo.
+CODE_FILES = ["ledger.py", "reconcile.py", "fees.py"]
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# Exportaciones de Neivor en la carpeta fuente: {ruta relativa: Path}
+def list_sources(source_dir=SOURCE_DIR):
+    source_dir = Path(source_dir)
+    if not source_dir.exists():
+        return {}
+    return {
+        path.relative_to(source_dir).as_posix(): path
+        for path in sorted(source_dir.rglob("*"))
+        if path.suffix.lower() in SOURCE_SUFFIXES and not path.name.startswith(("~$", "."))
+    }
+
+
+def code_digest():
+    digest = hashlib.sha256()
+    for name in CODE_FILES:
+        digest.update((BASE_DIR / name).read_bytes())
+    return digest.hexdigest()
+
+
+# {"code": huella de CODE_FILES, "sources": {ruta relativa: entrada}}
+def load_manifest(store_dir=STORE_DIR):
+    path = Path(store_dir) / "manifest.json"
+    if not path.exists():
+        return {"code": "", "sources": {}}
+    manifest = json.loads(path.read_text())
+    if "sources" not in manifest:
+        # Formato anterior, sólo con las fuentes: se vuelve a ingerir todo
+        manifest = {"code": "", "sources": manifest}
+    return manifest
+
+
+def save_manifest(manifest, store_dir=STORE_DIR):
+    path = Path(store_dir) / "manifest.json"
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True))
+    tmp.replace(path)
+
+
+# ¿Coincide la entrada del manifiesto con el archivo? Primero tamaño y fecha de
+# modificación; el hash sólo se calcula si alguno cambió.
+def source_unchanged(path, entry):
+    if not entry:
+        return False
+    stat = path.stat()
+    if entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+        return True
+    return entry["sha256"] == file_digest(path)
+
+
+def is_current(source_dir=SOURCE_DIR, store_dir=STORE_DIR):
+    manifest = load_manifest(store_dir)
+    if manifest["code"] != code_digest():
+        return False
+    entries, sources = manifest["sources"], list_sources(source_dir)
+    if set(sources) != set(entries):
+        return False
+    return all(source_unchanged(path, entries[name]) for name, path in sources.items())
+
+
+# Huella del contenido de las exportaciones ingeridas y del código que las
+# procesó; sirve como llave de caché. De cada fuente sólo entra su sha256:
+# volver a descargar o tocar una exportación idéntica no la cambia.
+def version(store_dir=STORE_DIR):
+    manifest = load_manifest(store_dir)
+    if not manifest["sources"]:
+        return ""
+    sources = {name: entry["sha256"] for name, entry in manifest["sources"].items()}
+    return hashlib.sha256(json.dumps([manifest["code"], sources], sort_keys=True).encode()).hexdigest()
+
+
+# Exportaciones que la ingesta no pudo leer: {ruta relativa: mensaje}
+def ingest_errors(store_dir=STORE_DIR):
+    return {name: entry["error"] for name, entry in load_manifest(store_dir)["sources"].items() if "error" in entry}
+
+
+# Discrepancias de conciliación precalculadas en la ingesta (ver reconcile)
+def read_discrepancies(store_dir=STORE_DIR):
+    path = Path(store_dir) / "aggregates" / "discrepancies.json"
+    if not path.exists():
+        return []
+    return json.loads(path.read_text())
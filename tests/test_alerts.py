@@ -0,0 +1,79 @@
+import shutil
+from datetime import date
+
+import pandas as pd
+
+import alerts
+import ledger
+from perf import synthetic
+
+
+def series(*rows):
+    frame = pd.DataFrame(rows, columns=["condominium", "period", "value"])
+    return frame.assign(month=alerts._month(frame["period"]))
+
+
+def test_incremental_refresh_matches_full_evaluation(tmp_path):
+    source, held, store_dir = tmp_path / "fuente", tmp_path / "pendientes", tmp_path / "parquet"
+    synthetic.write_ledgers(source, months=14, condominiums=2)
+    # Un mes intermedio y el último llegan en una segunda ingesta
+    held.mkdir()
+    for period in ("2024-10", "2025-05"):
+        for path in source.glob(f"*_{period}.csv"):
+            shutil.move(path, held / path.name)
+    ledger.ingest(source, store_dir)
+    for path in held.iterdir():
+        shutil.move(path, source / path.name)
+    changed = ledger.ingest(source, store_dir)
+    assert changed["movements"] == ["2024-10", "2025-05"]
+    incremental = alerts.read_alerts(store_dir)
+
+    (store_dir / "aggregates" / "alerts.json").unlink()
+    full = alerts.refresh(store_dir)
+    assert incremental == full
+    assert {alert["rule"] for alert in full} >= {"admon_salto", "saldo_faltante"}
+    assert alerts.is_current(store_dir)
+
+
+def test_rules_without_matching_months_yield_no_alerts():
+    flat = series(
+        ("Privada Parma", "2025-01", 100_000.0),
+        ("Privada Parma", "2025-02", 100_500.0),
+        ("Privada Parma", "2025-03", 101_000.0),
+    )
+    checks = [
+        ("threshold", {"above": 300_000}),
+        ("jump", {"pct": 50}),
+        ("growth", {"window": 3, "min_rate": 20_000}),
+        ("gap", {"until": "2025-03"}),
+    ]
+    for check, params in checks:
+        rule = alerts.Rule("prueba", "reserva", "saldo_final", check, params, "warning", "{period}")
+        assert alerts.evaluate(rule, flat) == []
+        if alerts.reach(rule) is not None:
+            assert alerts.evaluate(rule, flat, targets={flat["month"].iloc[-1]}) == []
+
+
+def test_gap_reports_trailing_missing_months():
+    found = alerts.check_gap(
+        series(
+            ("Privada Parma", "2025-04", 1),
+            ("Privada Parma", "2025-06", 1),
+            ("Otro", "2025-09", 1),
+        ),
+        until="2025-09",
+    )
+    assert list(zip(found["condominium"], found["period"])) == [
+        ("Privada Parma", "2025-05"),
+        ("Privada Parma", "2025-07"),
+        ("Privada Parma", "2025-08"),
+        ("Privada Parma", "2025-09"),
+    ]
+
+
+def test_gap_rule_follows_the_last_closed_month():
+    rule = alerts.RULES[0]
+    assert alerts.resolve(rule, date(2025, 8, 15)).params["until"] == "2025-07"
+    assert alerts.resolve(rule, date(2026, 1, 2)).params["until"] == "2025-12"
+    # Al cambiar de mes la huella cambia y la regla se vuelve a evaluar
+    assert alerts.rule_digest(alerts.resolve(rule, date(2025, 8, 1))) != alerts.rule_digest(alerts.resolve(rule, date(2025, 9, 1)))
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+from downsample import aggregate, downsample, lttb, minmax
+
+
+def walk(size, seed=0):
+    x = pd.date_range("2015-01-01", periods=size, freq="D").to_numpy()
+    y = np.random.default_rng(seed).normal(size=size).cumsum()
+    return x, y
+
+
+def assert_selection(indices, size):
+    assert np.all(np.diff(indices) > 0)
+    assert indices[0] == 0 and indices[-1] == size - 1
+
+
+def test_indices_are_increasing_and_keep_the_ends():
+    x, y = walk(5000)
+    # downsample con 5000 puntos pasa por min-max; con 300, sólo por LTTB
+    for size, indices in [
+        (5000, lttb(x, y, 100)),
+        (5000, minmax(y, 100)),
+        (5000, downsample(x, y, 100)),
+        (300, downsample(x[:300], y[:300], 100)),
+    ]:
+        assert_selection(indices, size)
+    assert len(lttb(x, y, 100)) == 100
+    assert len(downsample(x, y, 100)) == 100
+
+
+def test_a_lone_spike_survives():
+    # Con pre-selección min-max (serie > MINMAX_FACTOR × n) y sólo con LTTB
+    for size, spike in [(10_000, 4321), (600, 321)]:
+        x, y = np.arange(size), np.zeros(size)
+        y[spike] = 1e6
+        assert spike in downsample(x, y, 200)
+        y[spike] = -1e6
+        assert spike in downsample(x, y, 200)
+
+
+def test_short_series_pass_through():
+    x, y = walk(50)
+    for indices in (lttb(x, y, 50), minmax(y, 80), downsample(x, y, 50)):
+        assert list(indices) == list(range(50))
+
+
+def test_aggregate_uses_the_finest_frequency_within_the_budget():
+    dates = pd.date_range("2024-01-01", "2025-02-04", freq="D")
+    values = np.arange(len(dates), dtype=float)
+
+    daily = aggregate(dates, values, "sum", max_buckets=len(dates))
+    assert len(daily) == len(dates)
+
+    weekly = aggregate(dates, values, "sum", max_buckets=120)
+    assert weekly.index.freqstr.startswith("W")
+    assert weekly.sum() == values.sum()
+
+    # Saldos: el último valor de cada mes
+    monthly = aggregate(dates, values, "last", max_buckets=20)
+    assert monthly.index.freqstr == "MS"
+    assert len(monthly) == 14
+    assert monthly.iloc[0] == values[30]  # 31 de enero
+    assert monthly.iloc[-1] == values[-1]
@@ -0,0 +1,54 @@
+import pandas as pd
+
+from duplicates import COLUMNS, find_duplicates
+
+
+def movements(*rows):
+    frame = pd.DataFrame(rows, columns=["period", "date", "kind", "concept", "amount"])
+    frame.insert(0, "condominium", "Privada Parma")
+    frame.insert(1, "account", "BANCO")
+    frame["date"] = pd.to_datetime(frame["date"])
+    return frame
+
+
+def groups(found, finding):
+    rows = found[found["finding"] == finding]
+    return sorted(tuple(sorted(group["concept"])) for _, group in rows.groupby("group"))
+
+
+def test_mirror_entry_as_income_and_expense():
+    found = find_duplicates(movements(
+        ("2024-11", "2024-11-05", "ingreso", "Devolución de pago jardinera", 3500.0),
+        ("2024-11", "2024-11-20", "egreso", "DEVOLUCION DE PAGO JARDINERA", 3500.0),
+        ("2024-11", "2024-11-20", "egreso", "VIGILANCIA", 28000.0),
+    ))
+    assert groups(found, "espejo") == [("DEVOLUCION DE PAGO JARDINERA", "Devolución de pago jardinera")]
+    assert "VIGILANCIA" not in set(found["concept"])
+
+
+def test_exact_duplicate():
+    found = find_duplicates(movements(
+        ("2025-01", "2025-01-31", "egreso", "ADMINISTRACION", 10455.0),
+        ("2025-01", "2025-01-31", "egreso", "Administración", 10455.0),
+        ("2025-02", "2025-02-28", "egreso", "ADMINISTRACION", 10455.0),
+    ))
+    assert groups(found, "duplicado") == [("ADMINISTRACION", "Administración")]
+
+
+def test_similar_concepts_in_the_same_month():
+    found = find_duplicates(movements(
+        ("2024-11", "2024-11-10", "egreso", "DEVOLUCION DE PAGO JARDINERA", 1200.0),
+        ("2024-11", "2024-11-12", "egreso", "JARDINERIA", 3500.0),
+        ("2024-12", "2024-12-12", "egreso", "JARDINERIA", 3500.0),
+    ))
+    assert groups(found, "similar") == [("DEVOLUCION DE PAGO JARDINERA", "JARDINERIA")]
+
+
+def test_clean_ledger_has_no_findings():
+    found = find_duplicates(movements(
+        ("2025-01", "2025-01-31", "egreso", "ADMINISTRACION", 10455.0),
+        ("2025-01", "2025-01-31", "egreso", "VIGILANCIA", 28000.0),
+        ("2025-01", "2025-01-05", "ingreso", "CUOTA DE MANTENIMIENTO", 99044.5),
+    ))
+    assert found.empty
+    assert list(found.columns) == COLUMNS
@@ -0,0 +1,50 @@
+import math
+
+import pandas as pd
+
+from fees import DEVIATION_COLUMNS, MODE_COLUMNS, analyze_charges, month_over_month
+
+
+def charges(*rows):
+    frame = pd.DataFrame(rows, columns=["period", "unit", "concept", "amount"])
+    frame.insert(0, "condominium", "Privada Parma")
+    return frame
+
+
+def test_tied_amounts_pick_the_smaller_as_the_mode():
+    modes, _ = analyze_charges(charges(
+        ("2025-01", "U-001", "CUOTA", 1500.0),
+        ("2025-01", "U-002", "CUOTA", 1500.0),
+        ("2025-01", "U-003", "CUOTA", 1650.0),
+        ("2025-01", "U-004", "CUOTA", 1650.0),
+    ))
+    assert list(modes.columns) == MODE_COLUMNS
+    assert modes.iloc[0]["modal_amount"] == 1500.0
+    assert modes.iloc[0]["outliers"] == 2
+
+
+def test_units_off_the_mode_are_outliers():
+    modes, deviations = analyze_charges(charges(
+        ("2025-01", "U-001", "CUOTA", 1500.0),
+        ("2025-01", "U-002", "CUOTA", 1500.004),
+        # Dos líneas del mismo concepto en el mes se suman por unidad
+        ("2025-01", "U-003", "CUOTA", 750.0),
+        ("2025-01", "U-003", "CUOTA", 750.0),
+        ("2025-01", "U-004", "CUOTA", 1650.0),
+    ))
+    assert list(deviations.columns) == DEVIATION_COLUMNS
+    assert list(zip(deviations["unit"], deviations["deviation"])) == [("U-004", 150.0)]
+    row = modes.iloc[0]
+    assert (row["units"], row["outliers"], row["max_deviation"]) == (4, 1, 150.0)
+
+
+def test_month_over_month_skips_a_missing_month():
+    modes, _ = analyze_charges(charges(
+        ("2025-01", "U-001", "CUOTA", 1500.0),
+        ("2025-03", "U-001", "CUOTA", 1650.0),
+        ("2025-04", "U-001", "CUOTA", 1700.0),
+    ))
+    changes = month_over_month(modes)
+    assert list(changes["period"]) == ["2025-01", "2025-03", "2025-04"]
+    assert math.isnan(changes.iloc[1]["change"])
+    assert (changes.iloc[2]["previous_amount"], changes.iloc[2]["change"]) == (1650.0, 50.0)
@@ -0,0 +1,91 @@
+import csv
+
+import pandas as pd
+
+import ledger
+import store
+
+
+def write_statement(path, period, amount="1000.00"):
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["Cuenta", "Fecha", "Concepto", "Tipo", "Monto"])
+        writer.writerow(["BANCO", f"{period}-01", "SALDO INICIAL", "Saldo inicial", "5000.00"])
+        writer.writerow(["BANCO", f"{period}-05", "CUOTA DE MANTENIMIENTO", "Ingreso", amount])
+        writer.writerow(["BANCO", f"{period}-28", "SALDO FINAL", "Saldo final", "6000.00"])
+
+
+def incomes(store_dir):
+    movements = ledger.read_movements(store_dir)
+    rows = movements[movements["kind"] == "ingreso"]
+    return dict(zip(rows["period"], rows["amount"]))
+
+
+def test_bad_export_is_recorded_and_the_rest_is_ingested(tmp_path):
+    source, store_dir = tmp_path / "fuente", tmp_path / "parquet"
+    source.mkdir()
+    write_statement(source / "estado_2025-01.csv", "2025-01")
+    write_statement(source / "estado_2025-02.csv", "2025-02", amount="mil pesos")
+
+    assert ledger.ingest(source, store_dir) == {"movements": ["2025-01"]}
+    assert incomes(store_dir) == {"2025-01": 1000.0}
+    assert list(store.ingest_errors(store_dir)) == ["estado_2025-02.csv"]
+    # El archivo malo no se vuelve a leer en cada ejecución
+    assert store.is_current(source, store_dir)
+    assert ledger.ingest(source, store_dir) == {}
+
+
+def test_bad_update_keeps_the_last_good_data(tmp_path):
+    source, store_dir = tmp_path / "fuente", tmp_path / "parquet"
+    source.mkdir()
+    path = source / "estado_2025-01.csv"
+    write_statement(path, "2025-01")
+    ledger.ingest(source, store_dir)
+
+    write_statement(path, "2025-01", amount="mil pesos")
+    ledger.ingest(source, store_dir)
+    assert incomes(store_dir) == {"2025-01": 1000.0}
+    assert "estado_2025-01.csv" in store.ingest_errors(store_dir)
+
+    write_statement(path, "2025-01", amount="1500.00")
+    assert ledger.ingest(source, store_dir) == {"movements": ["2025-01"]}
+    assert incomes(store_dir) == {"2025-01": 1500.0}
+    assert store.ingest_errors(store_dir) == {}
+
+
+def test_period_column_is_read_as_the_month_end():
+    dates = ledger._parse_date(pd.Series(["2025-06", "2025-02", "2025-06-15", "15/06/2025", "2025-13"]))
+    assert [None if pd.isna(date) else str(date.date()) for date in dates] == [
+        "2025-06-30", "2025-02-28", "2025-06-15", "2025-06-15", None,
+    ]
+
+
+def test_code_change_ingests_everything_again(tmp_path, monkeypatch):
+    source, store_dir = tmp_path / "fuente", tmp_path / "parquet"
+    source.mkdir()
+    write_statement(source / "estado_2025-01.csv", "2025-01")
+    write_statement(source / "estado_2025-02.csv", "2025-02", amount="2000.00")
+    ledger.ingest(source, store_dir)
+    version = store.version(store_dir)
+
+    monkeypatch.setattr(store, "code_digest", lambda: "otra versión")
+    assert not store.is_current(source, store_dir)
+    assert ledger.ingest(source, store_dir) == {"movements": ["2025-01", "2025-02"]}
+    assert store.is_current(source, store_dir)
+    assert store.version(store_dir) != version
+    # Los part-files de la versión anterior se borran: no hay filas repetidas
+    assert incomes(store_dir) == {"2025-01": 1000.0, "2025-02": 2000.0}
+    assert len(ledger.read_movements(store_dir)) == 6
+
+
+def test_manifest_without_code_is_ingested_again(tmp_path):
+    source, store_dir = tmp_path / "fuente", tmp_path / "parquet"
+    source.mkdir()
+    write_statement(source / "estado_2025-01.csv", "2025-01")
+    ledger.ingest(source, store_dir)
+    # Manifiesto del formato anterior: sólo las fuentes
+    store.save_manifest(store.load_manifest(store_dir)["sources"], store_dir)
+
+    assert not store.is_current(source, store_dir)
+    assert ledger.ingest(source, store_dir) == {"movements": ["2025-01"]}
+    assert len(ledger.read_movements(store_dir)) == 3
@@ -0,0 +1,54 @@
+import math
+
+import pandas as pd
+
+from reconcile import COLUMNS, reconcile
+
+
+def monthly(*rows):
+    # (cuenta, periodo, saldo inicial, ingresos, egresos, saldo final)
+    frame = pd.DataFrame(rows, columns=["account", "period", "opening_balance", "total_incomes", "total_expenses", "ending_balance"])
+    frame.insert(0, "condominium", "Privada Parma")
+    return frame
+
+
+def findings(found):
+    return [(row.account, row.period, row.check, round(row.difference, 2)) for row in found.itertuples()]
+
+
+def test_continuity_break_between_consecutive_months():
+    found = reconcile(monthly(
+        ("BANCO", "2025-01", 1000.0, 500.0, 200.0, 1300.0),
+        ("BANCO", "2025-02", 1250.0, 100.0, 50.0, 1300.0),
+    ))
+    assert findings(found) == [("BANCO", "2025-02", "continuidad", -50.0)]
+    row = found.iloc[0]
+    assert (row["expected"], row["reported"]) == (1300.0, 1250.0)
+
+
+def test_no_continuity_check_across_accounts_or_month_gaps():
+    found = reconcile(monthly(
+        ("BANCO", "2025-01", 1000.0, 0.0, 0.0, 1000.0),
+        ("CAJA", "2025-02", 50.0, 0.0, 0.0, 50.0),
+        ("BANCO", "2025-03", 4000.0, 0.0, 0.0, 4000.0),
+    ))
+    assert found.empty
+    assert list(found.columns) == COLUMNS
+
+
+def test_cuadratura_mismatch():
+    found = reconcile(monthly(
+        ("BANCO", "2025-01", 1000.0, 500.0, 200.0, 1350.0),
+        ("BANCO", "2025-02", 1350.0, 0.005, 0.0, 1350.0),
+    ))
+    assert findings(found) == [("BANCO", "2025-01", "cuadratura", 50.0)]
+    assert found.iloc[0]["expected"] == 1300.0
+
+
+def test_missing_balances_never_flag():
+    found = reconcile(monthly(
+        ("BANCO", "2025-01", 1000.0, 500.0, 200.0, math.nan),
+        ("BANCO", "2025-02", math.nan, 100.0, 50.0, 1250.0),
+        ("BANCO", "2025-03", 1250.0, math.nan, math.nan, 1250.0),
+    ))
+    assert found.empty